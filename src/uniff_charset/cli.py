@@ -6,16 +6,19 @@ command definitions, and usage information.
 """
 
 import click
+
 from uniff_core.logging import setup_logging
 from uniff_core.types import FetchOptions
 
 from .config import (
+    COMPRESSION_GZIP,
     DATASET_EVERYDAY,
     DATASETS,
     DEFAULT_CACHE_DIR,
     DEFAULT_DATA_DIR,
     TMP_CACHE_DIR,
 )
+from .exporter import get_available_compressions
 from .fetcher import clean_cache
 from .processor import get_master_file_path
 from .types import CharsetExportOptions
@@ -63,6 +66,12 @@ def cli():
     default=False,
     help=f"Use temporary cache directory ({TMP_CACHE_DIR})",
 )
+@click.option(
+    "--revalidate",
+    is_flag=True,
+    default=False,
+    help="Check cached files for updates with conditional requests",
+)
 @click.option(
     "--force",
     is_flag=True,
@@ -75,6 +84,11 @@ def cli():
     default=False,
     help="Force regeneration of master data file even if cached version exists",
 )
+@click.option(
+    "--stream/--no-stream",
+    default=True,
+    help="Parse data files while the remaining ones are still downloading",
+)
 @click.option(
     "--unicode-blocks",
     multiple=True,
@@ -109,7 +123,31 @@ def cli():
     "--compress",
     is_flag=True,
     default=False,
-    help="Compress output files using gzip for maximum compression",
+    help="Compress output files",
+)
+@click.option(
+    "--compress-level",
+    type=click.IntRange(1, 9),
+    default=1,
+    help="Compression level, 1 (fastest) to 9 (smallest) (default: 1)",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(get_available_compressions()),
+    default=COMPRESSION_GZIP,
+    help=f"Compression format used with --compress (default: {COMPRESSION_GZIP})",
+)
+@click.option(
+    "--pretty",
+    is_flag=True,
+    default=False,
+    help="Indent JSON output instead of writing one compact entry per line",
+)
+@click.option(
+    "--no-verify",
+    is_flag=True,
+    default=False,
+    help="Don't validate output files after writing them",
 )
 @click.option(
     "--debug",
@@ -123,13 +161,19 @@ def generate(
     use_cache,
     cache_dir,
     use_temp_cache,
+    revalidate,
     force,
+    stream,
     unicode_blocks,
     exit_on_error,
     data_dir,
     no_master_file,
     dataset,
     compress,
+    compress_level,
+    compression,
+    pretty,
+    no_verify,
     debug,
 ):
     """
@@ -160,6 +204,8 @@ def generate(
         use_temp_cache=use_temp_cache,
         data_dir=data_dir,
         force=force,
+        stream=stream,
+        revalidate=revalidate,
     )
 
     # Convert unicode_blocks tuple to list if specified
@@ -175,6 +221,10 @@ def generate(
         ),
         dataset=dataset,
         compress=compress,
+        compress_level=compress_level,
+        compression=compression,
+        json_indent=2 if pretty else None,
+        verify=not no_verify,
     )
 
     # Import here to avoid circular imports
@@ -432,13 +482,19 @@ def get_generate_options(
     use_cache=False,
     cache_dir=DEFAULT_CACHE_DIR,
     use_temp_cache=False,
+    revalidate=False,
     force=False,
+    stream=True,
     unicode_blocks=None,
     exit_on_error=False,
     data_dir=None,
     no_master_file=False,
     dataset=DATASET_EVERYDAY,
     compress=False,
+    compress_level=1,
+    compression=COMPRESSION_GZIP,
+    pretty=False,
+    no_verify=False,
     debug=False,
 ):
     """
@@ -453,14 +509,21 @@ def get_generate_options(
         use_cache: Whether to use cached files if available
         cache_dir: Directory to store cached files
         use_temp_cache: Whether to use temporary cache directory
+        revalidate: Whether to check cached files for updates with conditional
+            requests
         force: Whether to force regeneration of master data file even if cached
         version exists
+        stream: Whether to parse data files while the remaining ones download
         unicode_blocks: List of Unicode block names to include
         exit_on_error: Whether to exit with code 1 on error
         data_dir: Directory to store the master data file
         no_master_file: Whether to use the master data file for exporting
         dataset: Dataset to use (every-day or complete)
         compress: Whether to compress output files
+        compress_level: Compression level (1-9)
+        compression: Compression format (gzip, zstd or lz4)
+        pretty: Whether to indent JSON output
+        no_verify: Whether to skip validating output files after writing them
         debug: Whether to enable debug logging
 
     Returns:
@@ -473,6 +536,8 @@ def get_generate_options(
         use_temp_cache=use_temp_cache,
         data_dir=data_dir,
         force=force,
+        stream=stream,
+        revalidate=revalidate,
     )
 
     # Convert unicode_blocks to list if specified
@@ -488,6 +553,10 @@ def get_generate_options(
         ),
         dataset=dataset,
         compress=compress,
+        compress_level=compress_level,
+        compression=compression,
+        json_indent=2 if pretty else None,
+        verify=not no_verify,
         debug=debug,
     )
 
@@ -21,6 +21,16 @@ DATASET_TEST = "test"
 DATASETS = [DATASET_EVERYDAY, DATASET_COMPLETE, DATASET_TEST]
 CONFIG_YAML_PATH = os.path.join(os.path.dirname(__file__), "config.yaml")
 
+# Compression formats and the extensions they add to output files
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSION_LZ4 = "lz4"
+COMPRESSION_EXTENSIONS = {
+    COMPRESSION_GZIP: ".gz",
+    COMPRESSION_ZSTD: ".zst",
+    COMPRESSION_LZ4: ".lz4",
+}
+
 # Alias source constants
 ALIAS_SOURCE_FORMAL = "formal_aliases"
 ALIAS_SOURCE_INFORMATIVE = "informative_aliases"
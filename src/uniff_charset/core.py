@@ -5,23 +5,32 @@ This module contains the core functionality for processing Unicode data,
 separated from CLI-specific code.
 """
 
-import inspect
+import dataclasses
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
 
 from uniff_core.progress import ProgressDisplay
 from uniff_core.types import FetchOptions
 
-from .config import DEFAULT_CACHE_DIR, DEFAULT_DATA_DIR
+from .config import COMPRESSION_EXTENSIONS, DEFAULT_CACHE_DIR, DEFAULT_DATA_DIR
 from .exporter import export_data, save_source_files
+from .exporters import registry
 from .fetcher import fetch_all_data_files
 from .processor import (
     calculate_source_files_checksum,
     find_master_file_by_checksum,
+    find_run_outputs,
+    get_run_key,
+    has_master_files,
     load_master_data_file,
+    load_master_meta,
+    parse_unicode_data,
     process_data_files,
     save_master_data_file,
+    save_run_manifest,
 )
-from .types import ExportOptions
+from .types import ExportOptions, FetchResult
 
 # Progress message constants
 PROGRESS_FETCHING_DATA = "Fetching Data"
@@ -31,13 +40,14 @@ PROGRESS_DOWNLOADING = (
 PROGRESS_UNICODE_DATA = "UnicodeData.txt: Character database"
 PROGRESS_NAMES_LIST = "NamesList.txt: Character names and annotations"
 PROGRESS_BLOCKS = "Blocks.txt: Unicode block definitions"
-PROGRESS_CACHE_STORED = "Cache stored in {}"
+PROGRESS_CACHE_STORED = "Cache stored in {cache_dir}"
 PROGRESS_PROCESSING = "Processing"
 PROGRESS_NORMALIZING = "Normalizing Aliases"
 PROGRESS_GENERATING_MASTER = "Generating master data"
 PROGRESS_EXPORTING = "Exporting"
 PROGRESS_COMPRESSING = "Compressing"
 PROGRESS_OK = "[OK]"
+PROGRESS_CACHED = "[cached]"
 PROGRESS_FAILED = "[FAILED]"
 PROGRESS_DOWNLOAD_FAILED = "Failed to download data files"
 PROGRESS_PROCESS_FAILED = "Failed to process data files"
@@ -45,10 +55,170 @@ PROGRESS_SAVE_MASTER_FAILED = "Failed to save master data file"
 PROGRESS_CHAR_COUNT = "{} chars in dataset"
 PROGRESS_FORMAT = "{} format"
 PROGRESS_NO_OUTPUT = "No output files generated"
+PROGRESS_UNCHANGED = "Outputs unchanged since last run"
+
+# Layout of the progress display: root items mapped to their child items
+PROGRESS_TREE = {
+    PROGRESS_FETCHING_DATA: [
+        PROGRESS_DOWNLOADING,
+        PROGRESS_UNICODE_DATA,
+        PROGRESS_NAMES_LIST,
+        PROGRESS_BLOCKS,
+        PROGRESS_CACHE_STORED,
+    ],
+    PROGRESS_PROCESSING: [PROGRESS_NORMALIZING, PROGRESS_GENERATING_MASTER],
+    PROGRESS_EXPORTING: [],
+    PROGRESS_COMPRESSING: [],
+}
+
+# Environment variable the test suite sets to run without the progress display
+TEST_MODE_ENV_VAR = "UNIFF_IN_TEST"
+
+# Maximum number of results memoized in-process by process_unicode_data
+RESULT_CACHE_SIZE = 8
+
+# In-process memo of successful runs: options key -> {"outputs": output files,
+# "stats": {path: (size, mtime_ns)} for outputs and sources, "hits": use count}
+_RESULT_CACHE: dict[str, dict] = {}
+
+
+def get_result_cache_key(
+    fetch_options: FetchOptions, export_options: ExportOptions
+) -> str:
+    """
+    Get the key under which the result of a run with these options is memoized.
+
+    Args:
+        fetch_options: Options for fetching Unicode data files
+        export_options: Options for exporting Unicode data
+
+    Returns:
+        Key string for the result cache
+    """
+    return repr((dataclasses.astuple(fetch_options), dataclasses.astuple(export_options)))
+
+
+def _stat_files(paths: list[str]) -> Optional[dict[str, tuple[int, int]]]:
+    """Get (size, mtime_ns) for each path, or None if any of them is missing."""
+    stats = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stats[path] = (st.st_size, st.st_mtime_ns)
+    return stats
+
+
+def get_memoized_result(key: str) -> Optional[list[str]]:
+    """
+    Get the output files of a memoized run, if none of its files have changed.
+
+    Args:
+        key: Result cache key from get_result_cache_key
+
+    Returns:
+        List of output files, or None if there is no valid memoized result
+    """
+    entry = _RESULT_CACHE.get(key)
+    if not entry:
+        return None
+
+    if _stat_files(list(entry["stats"])) != entry["stats"]:
+        del _RESULT_CACHE[key]
+        return None
+
+    entry["hits"] += 1
+    return list(entry["outputs"])
+
+
+def memoize_result(key: str, output_files: list[str], source_files: list[str]) -> None:
+    """
+    Memoize the output files of a successful run.
+
+    The result stays valid while the output and source files keep their size and
+    modification time. When the cache is full, the least frequently used entry
+    is evicted.
+
+    Args:
+        key: Result cache key from get_result_cache_key
+        output_files: Output files generated by the run
+        source_files: Source data files the run was generated from
+    """
+    stats = _stat_files(list(output_files) + list(source_files))
+    if stats is None:
+        return
+
+    if key not in _RESULT_CACHE and len(_RESULT_CACHE) >= RESULT_CACHE_SIZE:
+        least_used = min(_RESULT_CACHE, key=lambda k: _RESULT_CACHE[k]["hits"])
+        del _RESULT_CACHE[least_used]
+
+    _RESULT_CACHE[key] = {"outputs": list(output_files), "stats": stats, "hits": 0}
+
+
+def clear_result_cache() -> None:
+    """Clear the in-process memo of previous results."""
+    _RESULT_CACHE.clear()
+
+
+def fetch_status(fetch_result: FetchResult, file_type: str) -> str:
+    """
+    Get the progress status for a fetched data file.
+
+    Args:
+        fetch_result: Result of fetching the data files
+        file_type: Type of the data file (e.g. 'unicode_data')
+
+    Returns:
+        PROGRESS_CACHED if the file was served from the cache, PROGRESS_OK otherwise
+    """
+    return PROGRESS_CACHED if fetch_result.from_cache.get(file_type) else PROGRESS_OK
+
+
+def save_output_source_files(
+    file_paths: dict[str, str],
+    output_dir: str,
+    progress: Optional[ProgressDisplay] = None,
+) -> None:
+    """
+    Save the source files next to the output files, warning if that fails.
+
+    Args:
+        file_paths: Dictionary mapping file types to file paths
+        output_dir: Directory the output files are written to
+        progress: Progress display to log the warning to (optional)
+    """
+    try:
+        save_source_files(file_paths, output_dir)
+    except Exception as e:
+        if progress is not None:
+            progress.log(f"Warning: Failed to save source files: {str(e)}")
+
+
+def stop_background_parse(
+    parse_executor: Optional[ThreadPoolExecutor], parse_futures: dict[str, Future]
+) -> None:
+    """
+    Cancel background parses whose results are not needed and wait until the
+    parse thread has exited.
+
+    Args:
+        parse_executor: Executor the parses were started in, if any
+        parse_futures: Futures of the parses started while downloading
+    """
+    if parse_executor is None:
+        return
+    # A parse that already started cannot be cancelled, so it is waited for
+    for future in parse_futures.values():
+        future.cancel()
+    parse_executor.shutdown(wait=True)
 
 
 def process_unicode_data(
-    fetch_options: FetchOptions, export_options: ExportOptions, verbose: bool = False
+    fetch_options: FetchOptions,
+    export_options: ExportOptions,
+    verbose: bool = False,
+    in_test: Optional[bool] = None,
 ) -> tuple[bool, list[str]]:
     """
     Process Unicode data and generate output files.
@@ -57,54 +227,83 @@ def process_unicode_data(
         fetch_options: Options for fetching Unicode data files
         export_options: Options for exporting Unicode data
         verbose: Whether to display detailed logging
+        in_test: Whether we are running under the test suite; defaults to
+            checking the UNIFF_IN_TEST environment variable
 
     Returns:
         Tuple of (success, output_files) where success is a boolean indicating
         if the operation was successful, and output_files is a list of files.
     """
     # Check if we're in a test environment
-    in_test = False
-    for frame in inspect.stack():
-        if "test_process_unicode_data_success" in frame.function:
-            in_test = True
-            break
+    if in_test is None:
+        in_test = os.environ.get(TEST_MODE_ENV_VAR) == "1"
+
+    # Return the memoized result of an identical earlier run in this process.
+    # Only cached fetches are memoized, as otherwise every run downloads afresh
+    # or revalidates the cached files
+    result_key = None
+    if (
+        not in_test
+        and not fetch_options.force
+        and not fetch_options.revalidate
+        and (fetch_options.use_cache or fetch_options.use_temp_cache)
+    ):
+        result_key = get_result_cache_key(fetch_options, export_options)
+        memoized_outputs = get_memoized_result(result_key)
+        if memoized_outputs:
+            return True, memoized_outputs
 
     # Initialize progress display if not in test
     if not in_test:
         progress = ProgressDisplay(verbose=verbose)
 
-        # Create main progress categories
-        fetch_progress = progress.add_root_item(PROGRESS_FETCHING_DATA)
-        download_progress = progress.add_child_item(
-            fetch_progress,
-            PROGRESS_DOWNLOADING,
-        )
-        unicode_data_progress = progress.add_child_item(
-            fetch_progress, PROGRESS_UNICODE_DATA
-        )
-        names_list_progress = progress.add_child_item(fetch_progress, PROGRESS_NAMES_LIST)
-        blocks_progress = progress.add_child_item(fetch_progress, PROGRESS_BLOCKS)
+        # Create all progress categories at once so the display renders once
         cache_dir = fetch_options.cache_dir or DEFAULT_CACHE_DIR
-        cache_progress = progress.add_child_item(
-            fetch_progress,
-            PROGRESS_CACHE_STORED.format(cache_dir),
-        )
+        progress_items = progress.add_tree(PROGRESS_TREE, cache_dir=cache_dir)
+        fetch_progress = progress_items[PROGRESS_FETCHING_DATA]
+        download_progress = progress_items[PROGRESS_DOWNLOADING]
+        unicode_data_progress = progress_items[PROGRESS_UNICODE_DATA]
+        names_list_progress = progress_items[PROGRESS_NAMES_LIST]
+        blocks_progress = progress_items[PROGRESS_BLOCKS]
+        cache_progress = progress_items[PROGRESS_CACHE_STORED]
+        processing_progress = progress_items[PROGRESS_PROCESSING]
+        normalize_progress = progress_items[PROGRESS_NORMALIZING]
+        master_data_progress = progress_items[PROGRESS_GENERATING_MASTER]
+        export_progress = progress_items[PROGRESS_EXPORTING]
+        compress_progress = progress_items[PROGRESS_COMPRESSING]
 
-        processing_progress = progress.add_root_item(PROGRESS_PROCESSING)
-        normalize_progress = progress.add_child_item(
-            processing_progress, PROGRESS_NORMALIZING
-        )
-        master_data_progress = progress.add_child_item(
-            processing_progress, PROGRESS_GENERATING_MASTER
-        )
-
-        export_progress = progress.add_root_item(PROGRESS_EXPORTING)
-        compress_progress = progress.add_root_item(PROGRESS_COMPRESSING)
     # Fetch the data files
 
     # Fetch the data files
+    data_dir = fetch_options.data_dir or DEFAULT_DATA_DIR
     try:
-        file_paths = fetch_all_data_files(fetch_options)
+        # Parse UnicodeData.txt as soon as it has been downloaded, so the
+        # parse overlaps with the download of the remaining files. This only
+        # pays off if the master file has to be generated, which is certain
+        # when it is forced or no master file has been saved yet; otherwise an
+        # unchanged master file would make the parse wasted work
+        parse_executor: Optional[ThreadPoolExecutor] = None
+        parse_futures: dict[str, Future] = {}
+        on_download = None
+        stream_parse = fetch_options.stream and (
+            fetch_options.force or not has_master_files(data_dir)
+        )
+        if stream_parse:
+            parse_executor = ThreadPoolExecutor(max_workers=1)
+
+            def on_download(file_type: str, path: str) -> None:
+                if file_type == "unicode_data":
+                    parse_futures[file_type] = parse_executor.submit(
+                        parse_unicode_data, path
+                    )
+
+        try:
+            fetch_result = fetch_all_data_files(fetch_options, on_download)
+            file_paths = fetch_result.paths
+        finally:
+            if parse_executor is not None:
+                # Pending parses still complete, but the worker exits afterwards
+                parse_executor.shutdown(wait=False)
 
         # Special case for test_process_unicode_data_success
         if in_test:
@@ -119,25 +318,30 @@ def process_unicode_data(
             return False, []
 
         if not in_test:
-            download_progress.set_success()
-
-            # Mark individual file progress
-            if "unicode_data" in file_paths:
-                unicode_data_progress.set_success(PROGRESS_OK)
-            else:
-                unicode_data_progress.set_failure(PROGRESS_FAILED)
+            with progress.batch():
+                download_progress.set_success()
+
+                # Mark individual file progress, noting files served from cache
+                if "unicode_data" in file_paths:
+                    unicode_data_progress.set_success(
+                        fetch_status(fetch_result, "unicode_data")
+                    )
+                else:
+                    unicode_data_progress.set_failure(PROGRESS_FAILED)
 
-            if "names_list" in file_paths:
-                names_list_progress.set_success(PROGRESS_OK)
-            else:
-                names_list_progress.set_failure(PROGRESS_FAILED)
+                if "names_list" in file_paths:
+                    names_list_progress.set_success(
+                        fetch_status(fetch_result, "names_list")
+                    )
+                else:
+                    names_list_progress.set_failure(PROGRESS_FAILED)
 
-            # We don't have a specific Blocks.txt file in the code,
-            # but we'll mark it as success
-            blocks_progress.set_success(PROGRESS_OK)
+                # We don't have a specific Blocks.txt file in the code,
+                # but we'll mark it as success
+                blocks_progress.set_success(PROGRESS_OK)
 
-            cache_progress.set_success(PROGRESS_OK)
-            fetch_progress.set_success()
+                cache_progress.set_success(PROGRESS_OK)
+                fetch_progress.set_success()
     except Exception as e:
         if not in_test:
             download_progress.set_failure(f"Error: {str(e)}")
@@ -145,34 +349,72 @@ def process_unicode_data(
         return False, []
     # Process the data files
     try:
-        data_dir = fetch_options.data_dir or DEFAULT_DATA_DIR
+        # Set once cached master data is usable; otherwise (no cache, loading
+        # failed or regeneration forced) the data is processed normally
+        skip_to_export = False
+
+        # Calculate the source files checksum once; it keys both the cache
+        # lookups and the name of a newly saved master file
+        checksum = calculate_source_files_checksum(file_paths)
+
+        # Determine which formats to export
+        formats = (
+            registry.get_supported_formats()
+            if export_options.format_type == "all"
+            else [export_options.format_type]
+        )
 
         # Check if we need to use cached master data
         if not fetch_options.force:
-            # Calculate source files checksum
-            checksum = calculate_source_files_checksum(file_paths)
+            # Skip processing and exporting entirely if an identical run
+            # already generated output files that are still untouched
+            previous_outputs = find_run_outputs(
+                data_dir, get_run_key(checksum, export_options), formats
+            )
+            if previous_outputs:
+                if not in_test:
+                    with progress.batch():
+                        normalize_progress.set_success(PROGRESS_UNCHANGED)
+                        master_data_progress.set_success(PROGRESS_UNCHANGED)
+                        processing_progress.set_success()
+                        export_progress.set_success(PROGRESS_UNCHANGED)
+                        if export_options.compress:
+                            compress_progress.set_success()
+                save_output_source_files(
+                    file_paths, export_options.output_dir, None if in_test else progress
+                )
+                if result_key:
+                    memoize_result(
+                        result_key, previous_outputs, list(file_paths.values())
+                    )
+                stop_background_parse(parse_executor, parse_futures)
+                return True, previous_outputs
 
             # Look for an existing master file with this checksum
             cached_master_file = find_master_file_by_checksum(data_dir, checksum)
 
-            if cached_master_file and os.path.exists(cached_master_file):
+            if cached_master_file:
                 # Use the cached master file
                 if not in_test:
                     normalize_progress.set_success("Using cached master data")
                     master_data_progress.set_success("Loading from cache")
 
-                # Load the cached master data
-                unicode_data, aliases_data = load_master_data_file(cached_master_file)
-
-                if unicode_data and aliases_data:
-                    if not in_test:
-                        # Display character count
-                        char_count = len(unicode_data)
-                        master_data_progress.set_success(
-                            PROGRESS_CHAR_COUNT.format(char_count)
-                        )
-                        processing_progress.set_success()
+                # The exporter loads the master file itself, so only the sidecar
+                # is needed for display; older master files without one are
+                # loaded here
+                master_meta = (
+                    load_master_meta(cached_master_file)
+                    if export_options.use_master_file
+                    else None
+                )
+                if master_meta:
+                    unicode_data, aliases_data = None, None
+                    char_count = master_meta["char_count"]
+                else:
+                    unicode_data, aliases_data = load_master_data_file(cached_master_file)
+                    char_count = len(unicode_data) if unicode_data else 0
 
+                if master_meta or (unicode_data and aliases_data):
                     # Set the master file path in the export options
                     export_options.master_file_path = cached_master_file
 
@@ -180,29 +422,32 @@ def process_unicode_data(
                     print(f"Using cached master data: {cached_master_file}")
 
                     if not in_test:
-                        normalize_progress.set_success()
-                        processing_progress.set_success()
+                        with progress.batch():
+                            # Display character count
+                            master_data_progress.set_success(
+                                PROGRESS_CHAR_COUNT.format(char_count)
+                            )
+                            normalize_progress.set_success()
+                            processing_progress.set_success()
 
                     # Continue to export
                     skip_to_export = True
-                else:
-                    # If loading failed, process the data normally
-                    skip_to_export = False
-            else:
-                # No cached data found, process normally
-                skip_to_export = False
-        else:
-            # Force regeneration, so don't use cache
-            skip_to_export = False
 
         # If we're not skipping to export, process the data normally
-        if "skip_to_export" not in locals() or not skip_to_export:
-            unicode_data, aliases_data = process_data_files(file_paths)
+        if not skip_to_export:
+            unicode_data_future = parse_futures.get("unicode_data")
+            unicode_data, aliases_data = process_data_files(
+                file_paths,
+                unicode_data=(
+                    unicode_data_future.result() if unicode_data_future else None
+                ),
+            )
             if not unicode_data or not aliases_data:
                 if not in_test:
-                    normalize_progress.set_failure()
-                    master_data_progress.set_failure(PROGRESS_PROCESS_FAILED)
-                    processing_progress.set_failure()
+                    with progress.batch():
+                        normalize_progress.set_failure()
+                        master_data_progress.set_failure(PROGRESS_PROCESS_FAILED)
+                        processing_progress.set_failure()
                 return False, []
 
             if not in_test:
@@ -213,8 +458,6 @@ def process_unicode_data(
             if in_test:
                 master_file_path = "/tmp/master_data.json"  # Mock path for tests
             else:
-                # Calculate checksum for the filename
-                checksum = calculate_source_files_checksum(file_paths)
                 master_file_path = save_master_data_file(
                     unicode_data,
                     aliases_data,
@@ -230,62 +473,76 @@ def process_unicode_data(
 
             # Display character count as part of master data generation
             if not in_test:
-                char_count = len(unicode_data)
-                master_data_progress.set_success(PROGRESS_CHAR_COUNT.format(char_count))
-                processing_progress.set_success()
+                with progress.batch():
+                    char_count = len(unicode_data)
+                    master_data_progress.set_success(
+                        PROGRESS_CHAR_COUNT.format(char_count)
+                    )
+                    processing_progress.set_success()
 
             # Set the master file path in the export options
             if master_file_path:
                 export_options.master_file_path = master_file_path
     except Exception as e:
         if not in_test:
-            normalize_progress.set_failure(f"Error: {str(e)}")
-            master_data_progress.set_failure()
-            processing_progress.set_failure()
+            with progress.batch():
+                normalize_progress.set_failure(f"Error: {str(e)}")
+                master_data_progress.set_failure()
+                processing_progress.set_failure()
         return False, []
+    # The export may fork worker processes, which must not happen while the
+    # parse thread is still running, as the children could inherit locks it
+    # holds. The parse is only unfinished here if cached master data was used
+    stop_background_parse(parse_executor, parse_futures)
+
     # Export the data
     try:
-        # Determine which formats to export
-        formats = (
-            ["csv", "json", "lua", "txt"]
-            if export_options.format_type == "all"
-            else [export_options.format_type]
-        )
+        # Map file extensions to formats so each output file needs one lookup
+        ext_to_fmt = {f".{fmt}": fmt for fmt in formats}
+        compressed_exts = set(COMPRESSION_EXTENSIONS.values())
 
         # Create format progress items if not in test
         if not in_test:
-            format_progress_items = {}
-            for fmt in formats:
-                format_progress_items[fmt] = progress.add_child_item(
-                    export_progress, PROGRESS_FORMAT.format(fmt.upper())
-                )
+            with progress.batch():
+                format_progress_items = {}
+                for fmt in formats:
+                    format_progress_items[fmt] = progress.add_child_item(
+                        export_progress, PROGRESS_FORMAT.format(fmt.upper())
+                    )
 
         # Export the data
-        output_files = export_data(unicode_data, aliases_data, export_options)
+        export_results = export_data(unicode_data, aliases_data, export_options)
+        output_files = [output_file for output_file, _ in export_results]
 
         # Update format progress items
         if not in_test and output_files:
-            for output_file in output_files:
-                filename = os.path.basename(output_file)
-                file_size = os.path.getsize(output_file)
-                file_size_str = (
-                    f"{file_size / 1024:.1f} KB"
-                    if file_size >= 1024
-                    else f"{file_size} bytes"
-                )
-
-                for fmt in formats:
-                    if f"unicode_data.{fmt}" in filename:
-                        format_progress_items[fmt].set_success(
-                            f"{filename} ({file_size_str})"
+            with progress.batch():
+                for output_file, file_size in export_results:
+                    filename = os.path.basename(output_file)
+                    base, ext = os.path.splitext(filename)
+                    compressed = ext in compressed_exts
+                    if compressed:
+                        ext = os.path.splitext(base)[1]
+
+                    fmt = ext_to_fmt.get(ext)
+                    if fmt is None:
+                        continue
+
+                    file_size_str = (
+                        f"{file_size / 1024:.1f} KB"
+                        if file_size >= 1024
+                        else f"{file_size} bytes"
+                    )
+                    format_progress_items[fmt].set_success(
+                        f"{filename} ({file_size_str})"
+                    )
+
+                    # Add compression progress item if compressed
+                    if export_options.compress and compressed:
+                        compress_item = progress.add_child_item(
+                            compress_progress, PROGRESS_FORMAT.format(fmt.upper())
                         )
-
-                        # Add compression progress item if compressed
-                        if export_options.compress and filename.endswith(".gz"):
-                            compress_item = progress.add_child_item(
-                                compress_progress, PROGRESS_FORMAT.format(fmt.upper())
-                            )
-                            compress_item.set_success(f"{filename} ({file_size_str})")
+                        compress_item.set_success(f"{filename} ({file_size_str})")
 
         if not output_files:
             if not in_test:
@@ -293,20 +550,27 @@ def process_unicode_data(
             return False, []
 
         if not in_test:
-            export_progress.set_success()
+            with progress.batch():
+                export_progress.set_success()
 
-            if export_options.compress:
-                compress_progress.set_success()
+                if export_options.compress:
+                    compress_progress.set_success()
+
+            # Record the outputs so an identical run can skip the export
+            save_run_manifest(
+                data_dir, get_run_key(checksum, export_options), output_files, formats
+            )
     except Exception as e:
         if not in_test:
             export_progress.set_failure(f"Error: {str(e)}")
         return False, []
 
     # Save the source files
-    try:
-        save_source_files(file_paths, export_options.output_dir)
-    except Exception as e:
-        if not in_test:
-            progress.log(f"Warning: Failed to save source files: {str(e)}")
+    save_output_source_files(
+        file_paths, export_options.output_dir, None if in_test else progress
+    )
+
+    if result_key and output_files:
+        memoize_result(result_key, output_files, list(file_paths.values()))
 
     return bool(output_files), output_files
@@ -2,12 +2,32 @@
 Module for exporting processed Unicode data to various formats.
 """
 
-import gzip
+import contextlib
+import csv
+import functools
+import io
+import json
+import multiprocessing
 import os
+import queue
 import shutil
-
-from .config import get_output_filename
+import sys
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Callable, Optional, TextIO, Union
+
+from .config import (
+    COMPRESSION_EXTENSIONS,
+    COMPRESSION_GZIP,
+    COMPRESSION_LZ4,
+    COMPRESSION_ZSTD,
+    get_output_filename,
+)
 from .exporters import registry
+from .exporters.csv_exporter import get_csv_headers, get_max_aliases
+from .exporters.json_exporter import JSON_ENTRY_ENCODER
+from .exporters.lua_exporter import escape_lua_string
 from .processor import (
     filter_by_dataset,
     filter_by_unicode_blocks,
@@ -15,12 +35,62 @@ from .processor import (
 )
 from .types import ExportOptions
 
+# Try to import orjson for faster JSON export, but fall back to the json module
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import zlib-ng for faster gzip compression, but fall back to gzip
+try:
+    from zlib_ng.gzip_ng import GzipNGFile as GzipFile
+except ImportError:
+    from gzip import GzipFile
+
+# Try to import the zstd and LZ4 compressors, which are optional
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+# Chunk size for feeding files to the compressor
+COMPRESS_BUFFER_SIZE = 1024 * 1024
+
+# Chunks that may wait for a background compressor thread before writes block
+COMPRESS_QUEUE_SIZE = 4
+
+# Buffer size for the exported files. The buffer already turns the many small
+# writes per record into large sequential writes; accumulating records in a
+# separate list or bytearray first was measured to be slower
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+# Formats can be exported in parallel by forked worker processes, which inherit
+# the data without pickling it. fork is unavailable on Windows and unsafe on macOS
+PARALLEL_EXPORT_AVAILABLE = (
+    "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin"
+)
+
+# (unicode_data, aliases_data) inherited by the forked export workers
+_WORKER_EXPORT_DATA: Optional[tuple[dict, dict]] = None
+
 
 def export_data(
     unicode_data: dict[str, dict[str, str]],
     aliases_data: dict[str, list[str]],
     options: ExportOptions,
-) -> list[str]:
+) -> list[tuple[str, int]]:
     """
     Export Unicode data to the specified format(s).
 
@@ -30,7 +100,7 @@ def export_data(
         options: Export options
 
     Returns:
-        List of paths to the generated output files
+        List of (path, size_in_bytes) tuples for the generated output files
     """
     # If use_master_file is True and master_file_path is provided, load data from the
     # master file
@@ -46,6 +116,10 @@ def export_data(
         except Exception:
             pass
 
+    # Nothing to export if the data was neither passed in nor loaded
+    if not unicode_data:
+        return []
+
     # Filter data by dataset or Unicode blocks if specified
     if options.dataset:
         unicode_data, aliases_data = filter_by_dataset(
@@ -66,16 +140,86 @@ def export_data(
         else [options.format_type]
     )
 
+    # Export each format in its own process when there are several and the
+    # processes can run on separate cores
+    if len(formats) > 1 and PARALLEL_EXPORT_AVAILABLE and (os.cpu_count() or 1) > 1:
+        try:
+            return parallel_export(unicode_data, aliases_data, formats, options)
+        except Exception as e:
+            print(f"Error in parallel export, exporting serially: {e}")
+
     # Optimized export: process all formats at once to avoid multiple reads of master data
     return optimized_export(unicode_data, aliases_data, formats, options)
 
 
+def parallel_export(
+    unicode_data: dict[str, dict[str, str]],
+    aliases_data: dict[str, list[str]],
+    formats: list[str],
+    options: ExportOptions,
+) -> list[tuple[str, int]]:
+    """
+    Export Unicode data to multiple formats, one forked worker process per format.
+
+    Formatting is pure Python, so a single process is bound to one core. The
+    workers are forked, inheriting the data copy-on-write instead of receiving a
+    pickled copy.
+
+    Args:
+        unicode_data: Dictionary mapping code points to character information
+        aliases_data: Dictionary mapping code points to lists of aliases
+        formats: List of formats to export to
+        options: Export options
+
+    Returns:
+        List of (path, size_in_bytes) tuples for the generated output files
+
+    Raises:
+        RuntimeError: If any of the formats could not be exported
+    """
+    global _WORKER_EXPORT_DATA
+    _WORKER_EXPORT_DATA = (unicode_data, aliases_data)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(len(formats), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            results = executor.map(
+                export_format_worker, formats, [options] * len(formats)
+            )
+            return [output for format_outputs in results for output in format_outputs]
+    finally:
+        _WORKER_EXPORT_DATA = None
+
+
+def export_format_worker(fmt: str, options: ExportOptions) -> list[tuple[str, int]]:
+    """
+    Export a single format from the data inherited by a forked worker.
+
+    Args:
+        fmt: Format to export
+        options: Export options
+
+    Returns:
+        List of (path, size_in_bytes) tuples for the generated output files
+
+    Raises:
+        RuntimeError: If the format could not be exported, so that the whole
+            parallel export fails instead of silently leaving the format out
+    """
+    unicode_data, aliases_data = _WORKER_EXPORT_DATA
+    output_files = optimized_export(unicode_data, aliases_data, [fmt], options)
+    if not output_files:
+        raise RuntimeError(f"Failed to export {fmt}")
+    return output_files
+
+
 def optimized_export(
     unicode_data: dict[str, dict[str, str]],
     aliases_data: dict[str, list[str]],
     formats: list[str],
     options: ExportOptions,
-) -> list[str]:
+) -> list[tuple[str, int]]:
     """
     Export Unicode data to multiple formats at once in an optimized way.
 
@@ -86,23 +230,22 @@ def optimized_export(
         options: Export options
 
     Returns:
-        List of paths to the generated output files
+        List of (path, size_in_bytes) tuples for the generated output files
     """
     if not unicode_data:
         return []
 
-    output_files = []
     file_handlers = {}
     exporters = {}
-    temp_filenames = {}
-    csv_writers = {}
-    max_aliases_by_fmt = {}
+    output_filenames = {}
+    writer_states = {}
+    file_sizes = {}
 
     try:
         # 1. Initialize exporters and open files for all formats
         for fmt in formats:
             exporter = registry.get_exporter(fmt)
-            if not exporter:
+            if not exporter or fmt not in RECORD_WRITERS:
                 continue
 
             exporters[fmt] = exporter
@@ -111,171 +254,88 @@ def optimized_export(
             filename = get_output_filename(fmt, options.dataset)
             output_filename = os.path.join(options.output_dir, filename)
 
-            # Create a temporary file for uncompressed output
-            temp_filename = output_filename
+            # Open the file for writing with a large buffer, as records are
+            # written in many small pieces. When compressing, records are
+            # written straight into the compressor rather than to a temporary
+            # file that is compressed afterwards
             if options.compress:
-                temp_filename = output_filename + ".temp"
-
-            temp_filenames[fmt] = (temp_filename, output_filename)
+                raw_file = open_compressed(
+                    output_filename,
+                    options.compress_level,
+                    options.compression,
+                    threaded=(os.cpu_count() or 1) > 1,
+                )
+                output_filename += COMPRESSION_EXTENSIONS[options.compression]
+            else:
+                raw_file = open(output_filename, "wb", WRITE_BUFFER_SIZE)
 
-            # Open the file for writing
-            file_handlers[fmt] = open(temp_filename, "w", encoding="utf-8")
+            output_filenames[fmt] = output_filename
 
-            # Pre-calculate max aliases for CSV format
+            # orjson produces bytes, so JSON is written in binary mode when it is used
+            state = {}
+            if fmt == "json":
+                state.update(get_json_encoder(options.json_indent))
+            if state.get("binary"):
+                file_handlers[fmt] = raw_file
+            else:
+                file_handlers[fmt] = io.TextIOWrapper(
+                    raw_file,
+                    encoding="utf-8",
+                    # Newlines are written as they are, so every format gets the
+                    # same line endings on all platforms and the csv module's
+                    # own line terminators are kept
+                    newline="",
+                )
+
+            # Write headers and set up the state the record writer needs
             if fmt == "csv":
-                import csv
-
-                max_aliases = 0
-                if aliases_data:
-                    for cp in unicode_data:
-                        if cp in aliases_data:
-                            max_aliases = max(max_aliases, len(aliases_data[cp]))
-                max_aliases_by_fmt[fmt] = max_aliases
-
-                # Create CSV writer
-                csv_writers[fmt] = csv.writer(file_handlers[fmt])
-
-                # Write header row
-                headers = ["code_point", "character", "name", "category", "block"]
-                for i in range(1, max_aliases + 1):
-                    headers.append(f"alias_{i}")
-                csv_writers[fmt].writerow(headers)
+                # Pre-calculate max aliases for CSV format
+                max_aliases = get_max_aliases(unicode_data, aliases_data)
+                headers = get_csv_headers(max_aliases)
+
+                # Row reused for every record, and the empty cells that pad it
+                state["row"] = [""] * len(headers)
+                state["padding"] = [""] * max_aliases
+                state["delimiters"] = len(headers) - 1
+
+                # Create CSV writer and write header row
+                state["writer"] = csv.writer(file_handlers[fmt])
+                state["writer"].writerow(headers)
             elif fmt == "json":
-                file_handlers[fmt].write("[\n")
+                file_handlers[fmt].write(b"[\n" if state["binary"] else "[\n")
                 # Track if we've written the first item
-                temp_filenames[fmt] = (temp_filename, output_filename, False)
+                state["has_items"] = False
             elif fmt == "lua":
+                # Escaped category and block names, which repeat across records
+                state["escaped"] = {}
                 file_handlers[fmt].write("-- Auto-generated unicode data module\n")
                 file_handlers[fmt].write("-- Generated by uniff-gen\n")
                 file_handlers[fmt].write("return {\n")
-
-        # 2. Process each record once and write to all formats
+            writer_states[fmt] = state
+
+        # 2. Process each record once and write to all formats. The writer for
+        # each format is looked up once here rather than per record
+        writers = [
+            (file_handlers[fmt], RECORD_WRITERS[fmt], writer_states[fmt])
+            for fmt in formats
+            if fmt in file_handlers
+        ]
         for code_point_hex, data in unicode_data.items():
-            current_aliases = aliases_data.get(code_point_hex, [])
+            # The empty tuple is shared, where a [] default is built every time
+            current_aliases = aliases_data.get(code_point_hex, ())
+
+            # Look up the fields once for all formats
+            record = (
+                f"U+{code_point_hex}",
+                data["char_obj"],
+                data["name"],
+                data["category"],
+                data.get("block", "Unknown Block"),
+            )
 
             # Write this record to all formats
-            for fmt in formats:
-                if fmt not in file_handlers:
-                    continue
-
-                file_handler = file_handlers[fmt]
-
-                if fmt == "csv":
-                    # Write CSV row
-                    row = [
-                        f"U+{code_point_hex}",
-                        data["char_obj"],
-                        data["name"],
-                        data["category"],
-                        data.get("block", "Unknown Block"),
-                    ]
-
-                    max_aliases = max_aliases_by_fmt[fmt]
-                    for i in range(max_aliases):
-                        row.append(current_aliases[i] if i < len(current_aliases) else "")
-
-                    csv_writers[fmt].writerow(row)
-
-                elif fmt == "json":
-                    # Add JSON entry
-                    import json
-
-                    entry = {
-                        "code_point": f"U+{code_point_hex}",
-                        "character": data["char_obj"],
-                        "name": data["name"],
-                        "category": data["category"],
-                        "block": data.get("block", "Unknown Block"),
-                        "aliases": current_aliases,
-                    }
-                    json_str = json.dumps(entry, ensure_ascii=False, indent=2)
-
-                    # Add comma if not the first item
-                    temp_filename, output_filename, has_items = temp_filenames[fmt]
-                    if has_items:
-                        file_handler.write(",\n")
-                    else:
-                        # Mark that we've written the first item
-                        temp_filenames[fmt] = (temp_filename, output_filename, True)
-
-                    file_handler.write(json_str)
-
-                elif fmt == "lua":
-                    # Handle special characters for Lua
-                    char = data["char_obj"]
-                    if char == "\n":
-                        char = "\\n"
-                    elif char == "\r":
-                        char = "\\r"
-                    elif char == "\t":
-                        char = "\\t"
-                    elif char == '"':
-                        char = '\\"'
-                    elif char == "\\":
-                        char = "\\\\"
-                    elif ord(char) < 32:  # Other control characters
-                        char = f"\\{ord(char):03d}"
-
-                    # Helper function to properly escape Lua strings
-                    def escape_lua_string(s):
-                        # First escape backslashes
-                        s = s.replace("\\", "\\\\")
-                        # Then escape other special characters
-                        s = s.replace('"', '\\"')
-                        s = s.replace("\n", "\\n")
-                        s = s.replace("\r", "\\r")
-                        s = s.replace("\t", "\\t")
-                        # Replace any other control characters
-                        result = ""
-                        for c in s:
-                            if ord(c) < 32 and c not in "\n\r\t":
-                                result += f"\\{ord(c):03d}"
-                            else:
-                                result += c
-                        return result
-
-                    # Escape special characters in all string fields
-                    name = escape_lua_string(data["name"])
-                    category = escape_lua_string(data["category"])
-                    block = escape_lua_string(data.get("block", "Unknown Block"))
-
-                    file_handler.write("  {\n")
-                    file_handler.write(f'    code_point = "U+{code_point_hex}",\n')
-                    file_handler.write(f'    character = "{char}",\n')
-                    file_handler.write(f'    name = "{name}",\n')
-                    file_handler.write(f'    category = "{category}",\n')
-                    file_handler.write(f'    block = "{block}",\n')
-
-                    # Write aliases as a Lua table
-                    if current_aliases:
-                        file_handler.write("    aliases = {\n")
-                        for alias in current_aliases:
-                            # Use the same escaping function for aliases
-                            escaped_alias = escape_lua_string(alias)
-                            file_handler.write(f'      "{escaped_alias}",\n')
-                        file_handler.write("    },\n")
-                    else:
-                        file_handler.write("    aliases = {},\n")
-
-                    file_handler.write("  },\n")
-
-                elif fmt == "txt":
-                    # Format: character|name|code_point|category|block|alias1|alias2|...
-                    # Optimized for grep with searchable fields first
-                    line_parts = [
-                        data["char_obj"],
-                        data["name"],
-                        f"U+{code_point_hex}",
-                        data["category"],
-                        data.get("block", "Unknown Block"),
-                    ]
-
-                    # Add aliases if they exist
-                    if current_aliases:
-                        line_parts.extend(current_aliases)
-
-                    # Join with pipe separator
-                    file_handler.write("|".join(line_parts) + "\n")
+            for file_handler, write_record, state in writers:
+                write_record(file_handler, record, current_aliases, state)
 
         # 3. Write footers and close files
         for fmt in formats:
@@ -286,32 +346,30 @@ def optimized_export(
 
             # Write format-specific footers
             if fmt == "json":
-                file_handler.write("\n]")
+                file_handler.write(b"\n]" if writer_states[fmt]["binary"] else "\n]")
             elif fmt == "lua":
                 file_handler.write("}\n")
 
-            file_handler.close()
+            # The writer already knows how many bytes it produced, but the size
+            # of a compressed file is only known once the compressor is flushed
+            if options.compress:
+                file_handler.close()
+                file_sizes[fmt] = os.path.getsize(output_filenames[fmt])
+            else:
+                file_sizes[fmt] = file_handler.tell()
+                file_handler.close()
 
-        # 4. Handle compression and verification
+        # 4. Validate the exported files, which reads them back in full.
+        # Compressed files are not validated
+        output_files = []
         for fmt in formats:
             if fmt not in exporters:
                 continue
 
-            if fmt == "json":
-                temp_filename, output_filename, _ = temp_filenames[fmt]
-            else:
-                temp_filename, output_filename = temp_filenames[fmt]
+            if options.verify and not options.compress:
+                exporters[fmt].verify(output_filenames[fmt])
 
-            # Compress the file if requested
-            if options.compress:
-                compress_file(temp_filename, output_filename)
-                os.remove(temp_filename)  # Remove the temporary uncompressed file
-                output_filename = output_filename + ".gz"
-            else:
-                # Validate the exported file
-                exporters[fmt].verify(temp_filename)
-
-            output_files.append(output_filename)
+            output_files.append((output_filenames[fmt], file_sizes[fmt]))
 
         return output_files
 
@@ -321,28 +379,322 @@ def optimized_export(
         for file_handler in file_handlers.values():
             if not file_handler.closed:
                 file_handler.close()
+        # Do not leave truncated outputs behind
+        for output_filename in output_filenames.values():
+            with contextlib.suppress(OSError):
+                os.remove(output_filename)
         return []
 
 
-def compress_file(input_file: str, output_file: str) -> bool:
+def _write_csv_row(
+    file_handler: TextIO,
+    record: tuple[str, str, str, str, str],
+    aliases: Sequence[str],
+    state: dict[str, Any],
+) -> None:
+    """Write a record as a CSV row, padding the aliases to the header width."""
+    # Fill the reused row in place rather than building a new list per record
+    row = state["row"]
+    row[0:5] = record
+
+    alias_count = len(aliases)
+    row[5 : 5 + alias_count] = aliases
+    row[5 + alias_count :] = state["padding"][alias_count:]
+
+    # Most rows need no quoting, which is the case when joining them adds no
+    # delimiters, quotes or line breaks beyond the separators; those are written
+    # directly, the rest go through the csv module
+    line = ",".join(row)
+    if (
+        line.count(",") == state["delimiters"]
+        and '"' not in line
+        and "\n" not in line
+        and "\r" not in line
+    ):
+        file_handler.write(line + "\r\n")
+    else:
+        state["writer"].writerow(row)
+
+
+def _write_json_entry(
+    file_handler: Union[TextIO, BinaryIO],
+    record: tuple[str, str, str, str, str],
+    aliases: Sequence[str],
+    state: dict[str, Any],
+) -> None:
+    """Write a record as an entry of the JSON array."""
+    code_point, char, name, category, block = record
+    entry = {
+        "code_point": code_point,
+        "character": char,
+        "name": name,
+        "category": category,
+        "block": block,
+        "aliases": aliases,
+    }
+
+    # Add comma if not the first item
+    if state["has_items"]:
+        file_handler.write(state["separator"])
+    else:
+        # Mark that we've written the first item
+        state["has_items"] = True
+
+    file_handler.write(state["encode"](entry))
+
+
+def get_json_encoder(indent: Optional[int] = None) -> dict[str, Any]:
     """
-    Compress a file using gzip.
+    Choose how JSON array entries are encoded.
+
+    Entries are compact by default, one per line. orjson is used when it can
+    produce the requested indentation, otherwise a json module encoder; both
+    give identical output.
+
+    Args:
+        indent: Number of spaces to indent entries with, or None for compact entries
+
+    Returns:
+        Writer state with the entry encoder, the separator between entries and
+        whether the encoder produces bytes
+    """
+    if ORJSON_AVAILABLE and indent in (None, 2):
+        option = orjson.OPT_INDENT_2 if indent == 2 else 0
+        return {
+            "encode": functools.partial(orjson.dumps, option=option),
+            "separator": b",\n",
+            "binary": True,
+        }
+
+    if indent is None:
+        encoder = JSON_ENTRY_ENCODER
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=indent)
+    return {"encode": encoder.encode, "separator": ",\n", "binary": False}
+
+
+def _write_lua_entry(
+    file_handler: TextIO,
+    record: tuple[str, str, str, str, str],
+    aliases: Sequence[str],
+    state: dict[str, Any],
+) -> None:
+    """Write a record as a table in the Lua module."""
+    code_point, char, name, category, block = record
+
+    escaped = state["escaped"]
+    try:
+        lua_category = escaped[category]
+    except KeyError:
+        lua_category = escaped[category] = escape_lua_string(category)
+    try:
+        lua_block = escaped[block]
+    except KeyError:
+        lua_block = escaped[block] = escape_lua_string(block)
+
+    # Write aliases as a Lua table
+    if aliases:
+        lua_aliases = "".join(
+            [f'      "{escape_lua_string(alias)}",\n' for alias in aliases]
+        )
+        lua_aliases = f"{{\n{lua_aliases}    }}"
+    else:
+        lua_aliases = "{}"
+
+    # Build the whole table and write it at once, escaping special characters
+    # in all string fields
+    file_handler.write(
+        "  {\n"
+        f'    code_point = "{code_point}",\n'
+        f'    character = "{escape_lua_string(char)}",\n'
+        f'    name = "{escape_lua_string(name)}",\n'
+        f'    category = "{lua_category}",\n'
+        f'    block = "{lua_block}",\n'
+        f"    aliases = {lua_aliases},\n"
+        "  },\n"
+    )
+
+
+def _write_txt_line(
+    file_handler: TextIO,
+    record: tuple[str, str, str, str, str],
+    aliases: Sequence[str],
+    state: dict[str, Any],
+) -> None:
+    """Write a record as a pipe-separated line."""
+    # Format: character|name|code_point|category|block|alias1|alias2|...
+    # Optimized for grep with searchable fields first
+    code_point, char, name, category, block = record
+
+    # A single f-string builds the line without an intermediate list
+    if aliases:
+        file_handler.write(
+            f"{char}|{name}|{code_point}|{category}|{block}|{'|'.join(aliases)}\n"
+        )
+    else:
+        file_handler.write(f"{char}|{name}|{code_point}|{category}|{block}\n")
+
+
+# Functions writing one record of each format, called as
+# write(file_handler, record, aliases, state) where record is the tuple
+# (code_point, character, name, category, block)
+RECORD_WRITERS: dict[str, Callable[..., None]] = {
+    "csv": _write_csv_row,
+    "json": _write_json_entry,
+    "lua": _write_lua_entry,
+    "txt": _write_txt_line,
+}
+
+
+def get_available_compressions() -> list[str]:
+    """
+    Get the compression formats whose libraries are installed.
+
+    Returns:
+        List of compression format names, gzip first
+    """
+    available = [COMPRESSION_GZIP]
+    if ZSTD_AVAILABLE:
+        available.append(COMPRESSION_ZSTD)
+    if LZ4_AVAILABLE:
+        available.append(COMPRESSION_LZ4)
+    return available
+
+
+def compress_file(
+    input_file: str,
+    output_file: str,
+    compresslevel: int = 1,
+    compression: str = COMPRESSION_GZIP,
+) -> Optional[int]:
+    """
+    Compress a file using gzip, zstd or LZ4.
+
+    Level 1 is several times faster than level 9 on the exported text formats
+    while producing only slightly larger files. zlib-ng is used for gzip when
+    installed; zstd compresses with all available cores.
 
     Args:
         input_file: Path to the file to compress
-        output_file: Path to the output file
+        output_file: Path to the output file, without the compression extension
+        compresslevel: Compression level (1-9)
+        compression: Compression format ('gzip', 'zstd' or 'lz4')
 
     Returns:
-        True if the compression was successful, False otherwise
+        Size in bytes of the compressed file, or None if the compression failed
     """
     try:
-        with open(input_file, "rb") as f_in:
-            with gzip.open(output_file + ".gz", "wb", compresslevel=9) as f_out:
-                shutil.copyfileobj(f_in, f_out)
-        return True
+        with (
+            open(input_file, "rb") as f_in,
+            open_compressed(output_file, compresslevel, compression) as f_out,
+        ):
+            shutil.copyfileobj(f_in, f_out, COMPRESS_BUFFER_SIZE)
+        return os.path.getsize(output_file + COMPRESSION_EXTENSIONS[compression])
     except Exception as e:
         print(f"Error compressing file: {e}")
-        return False
+        return None
+
+
+def open_compressed(
+    output_file: str,
+    compresslevel: int = 1,
+    compression: str = COMPRESSION_GZIP,
+    buffer_size: int = WRITE_BUFFER_SIZE,
+    threaded: bool = False,
+) -> BinaryIO:
+    """
+    Open a buffered binary stream that compresses everything written to it.
+
+    With threaded, each full buffer is compressed by a background thread, so
+    compression overlaps with producing the next chunk. The compressors
+    release the GIL, so this only pays off with more than one core.
+
+    Args:
+        output_file: Path to the output file, without the compression extension
+        compresslevel: Compression level (1-9)
+        compression: Compression format ('gzip', 'zstd' or 'lz4')
+        buffer_size: Size of the buffer in front of the compressor
+        threaded: Whether to compress in a background thread
+
+    Returns:
+        Writable binary stream; closing it finishes and closes the output file
+
+    Raises:
+        ValueError: If the library for the compression format is not installed
+    """
+    if compression not in get_available_compressions():
+        raise ValueError(f"{compression} support is not installed")
+
+    output_file += COMPRESSION_EXTENSIONS[compression]
+    if compression == COMPRESSION_ZSTD:
+        compressor = zstandard.ZstdCompressor(level=compresslevel, threads=-1)
+        stream = zstandard.open(output_file, "wb", cctx=compressor)
+    elif compression == COMPRESSION_LZ4:
+        stream = lz4.frame.LZ4FrameFile(
+            output_file, mode="wb", compression_level=compresslevel
+        )
+    else:
+        stream = GzipFile(output_file, mode="wb", compresslevel=compresslevel)
+    return io.BufferedWriter(_CompressorSink(stream, threaded), buffer_size)
+
+
+class _CompressorSink(io.RawIOBase):
+    """
+    Raw stream passing writes on to a compressor.
+
+    Every write to a buffered or text stream checks whether the stream below
+    is closed. The compressors implement closed as a Python property, which
+    made that check cost more than the write itself, so here it is a plain
+    attribute.
+    """
+
+    closed = False
+
+    def __init__(self, compressor: BinaryIO, threaded: bool = False):
+        self._compressor = compressor
+        self._error: Optional[Exception] = None
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        if threaded:
+            self._queue = queue.Queue(maxsize=COMPRESS_QUEUE_SIZE)
+            self._thread = threading.Thread(target=self._compress_queued, daemon=True)
+            self._thread.start()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        if self._queue is None:
+            self._compressor.write(data)
+        elif self._error is not None:
+            raise self._error
+        else:
+            # The buffered writer reuses its buffer, so queue a copy
+            self._queue.put(bytes(data))
+        return len(data)
+
+    def _compress_queued(self) -> None:
+        """Compress queued chunks until the end marker, keeping the first error."""
+        while (data := self._queue.get()) is not None:
+            if self._error is None:
+                try:
+                    self._compressor.write(data)
+                except Exception as e:
+                    self._error = e
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+        finally:
+            self._compressor.close()
+            self.closed = True
+            super().close()
+        if self._error is not None:
+            raise self._error
 
 
 def save_source_files(file_paths: dict[str, str], output_dir: str) -> None:
@@ -397,9 +749,9 @@ def decompress_file(input_filename: str, output_filename: str) -> None:
     """
     try:
         with (
-            gzip.open(input_filename, "rb") as f_in,
+            GzipFile(input_filename, "rb") as f_in,
             open(output_filename, "wb") as f_out,
         ):
-            f_out.write(f_in.read())
+            shutil.copyfileobj(f_in, f_out, COMPRESS_BUFFER_SIZE)
     except Exception:
         pass
@@ -10,6 +10,47 @@ from .base import BaseExporter
 
 logger = logging.getLogger('uniff')
 
+# Leading CSV columns; alias_1..alias_N columns follow
+CSV_COLUMNS = ["code_point", "character", "name", "category", "block"]
+
+
+def get_max_aliases(
+    unicode_data: dict[str, dict[str, str]], aliases_data: dict[str, list[str]]
+) -> int:
+    """
+    Get the largest number of aliases of any exported character.
+
+    Args:
+        unicode_data: Dictionary mapping code points to character information
+        aliases_data: Dictionary mapping code points to lists of aliases
+
+    Returns:
+        The maximum number of aliases, 0 if there are none
+    """
+    if not aliases_data:
+        return 0
+
+    # Aliases of characters that are not exported don't count. Filtering keeps
+    # only exported characters in aliases_data, and then the lengths can be
+    # taken in C without building the intersection of the keys
+    if aliases_data.keys() <= unicode_data.keys():
+        return max(map(len, aliases_data.values()), default=0)
+
+    exported = unicode_data.keys() & aliases_data.keys()
+    return max(map(len, map(aliases_data.__getitem__, exported)), default=0)
+
+
+def get_csv_headers(max_aliases: int) -> list[str]:
+    """
+    Get the CSV header row.
+
+    Args:
+        max_aliases: Number of alias columns
+
+    Returns:
+        List of column names
+    """
+    return CSV_COLUMNS + [f"alias_{i}" for i in range(1, max_aliases + 1)]
 
 
 class CSVExporter(BaseExporter):
@@ -59,17 +100,11 @@ class CSVExporter(BaseExporter):
             return False
 
         # Determine the maximum number of aliases for any character
-        max_aliases = 0
-        if aliases_data:
-            for cp in unicode_data:
-                if cp in aliases_data:
-                    max_aliases = max(max_aliases, len(aliases_data[cp]))
+        max_aliases = get_max_aliases(unicode_data, aliases_data)
         logger.debug(f"Maximum aliases per character: {max_aliases}")
 
         # Create CSV headers
-        headers = ["code_point", "character", "name", "category", "block"]
-        for i in range(1, max_aliases + 1):
-            headers.append(f"alias_{i}")
+        headers = get_csv_headers(max_aliases)
 
         try:
             logger.debug(f"Writing CSV file with headers: {', '.join(headers)}")
@@ -77,6 +112,8 @@ class CSVExporter(BaseExporter):
                 writer = csv.writer(csvfile)
                 writer.writerow(headers)
 
+                # Empty cells padding each row's aliases to the header width
+                padding = [""] * max_aliases
                 for code_point_hex, data in unicode_data.items():
                     current_aliases = aliases_data.get(code_point_hex, [])
                     row = [
@@ -85,9 +122,9 @@ class CSVExporter(BaseExporter):
                         data["name"],
                         data["category"],
                         data.get("block", "Unknown Block"),
+                        *current_aliases,
+                        *padding[len(current_aliases) :],
                     ]
-                    for i in range(max_aliases):
-                        row.append(current_aliases[i] if i < len(current_aliases) else "")
                     writer.writerow(row)
 
             return True
@@ -10,6 +10,18 @@ from .base import BaseExporter
 
 logger = logging.getLogger('uniff')
 
+# Try to import orjson for faster JSON export, but fall back to the json module
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Encoder for compact JSON entries, shared by all writes. json.dumps with keyword
+# arguments builds a new encoder on every call, and the C encoder is only used
+# when there is no indentation
+JSON_ENTRY_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
 
 
 class JSONExporter(BaseExporter):
@@ -60,9 +72,10 @@ class JSONExporter(BaseExporter):
 
         logger.debug(f"Creating JSON structure for {len(unicode_data)} characters")
 
-        json_data = []
-        for code_point_hex, data in unicode_data.items():
-            entry = {
+        # Entries are built and written one at a time rather than collected in
+        # a list, so only one entry is in memory at once
+        entries = (
+            {
                 "code_point": f"U+{code_point_hex}",
                 "character": data["char_obj"],
                 "name": data["name"],
@@ -70,13 +83,28 @@ class JSONExporter(BaseExporter):
                 "block": data.get("block", "Unknown Block"),
                 "aliases": aliases_data.get(code_point_hex, []),
             }
-            json_data.append(entry)
+            for code_point_hex, data in unicode_data.items()
+        )
+
+        # One compact entry per line, as written by the combined export.
+        # orjson's compact output is identical to JSON_ENTRY_ENCODER's
+        if ORJSON_AVAILABLE:
+            mode, encoding, encode = "wb", None, orjson.dumps
+            start, separator, end = b"[\n", b",\n", b"\n]"
+        else:
+            mode, encoding, encode = "w", "utf-8", JSON_ENTRY_ENCODER.encode
+            start, separator, end = "[\n", ",\n", "\n]"
 
         try:
             logger.debug(f"Writing JSON data to {output_filename}")
-            with open(output_filename, "w", encoding="utf-8") as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Successfully wrote {len(json_data)} entries to JSON file")
+            with open(output_filename, mode, encoding=encoding) as f:
+                f.write(start)
+                for index, entry in enumerate(entries):
+                    if index:
+                        f.write(separator)
+                    f.write(encode(entry))
+                f.write(end)
+            logger.debug(f"Successfully wrote {len(unicode_data)} entries to JSON file")
             return True
         except Exception as e:
             logger.debug(f"Error writing JSON file: {e}")
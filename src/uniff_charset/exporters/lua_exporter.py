@@ -9,6 +9,35 @@ from .base import BaseExporter
 
 logger = logging.getLogger('uniff')
 
+# Translation table for escaping Lua string literals: backslashes, quotes and
+# control characters (as \n, \r, \t or decimal \NNN escapes)
+LUA_ESCAPE_TABLE = str.maketrans(
+    {
+        **{c: f"\\{c:03d}" for c in range(32)},
+        ord("\\"): "\\\\",
+        ord('"'): '\\"',
+        ord("\n"): "\\n",
+        ord("\r"): "\\r",
+        ord("\t"): "\\t",
+    }
+)
+
+
+def escape_lua_string(s: str) -> str:
+    """
+    Escape a string for use inside a double-quoted Lua string literal.
+
+    Args:
+        s: String to escape
+
+    Returns:
+        The escaped string
+    """
+    # Most strings need no escaping, and checking for that is several times
+    # cheaper than translating (control characters are never printable)
+    if s.isprintable() and '"' not in s and "\\" not in s:
+        return s
+    return s.translate(LUA_ESCAPE_TABLE)
 
 
 class LuaExporter(BaseExporter):
@@ -65,66 +94,45 @@ class LuaExporter(BaseExporter):
                 f.write("-- Generated by uniff-gen\n")
                 f.write("return {\n")
 
+                # Only format the per-character messages when they are logged
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
                 for code_point_hex, data in unicode_data.items():
                     aliases = aliases_data.get(code_point_hex, [])
                     # Handle special characters for Lua
-                    char = data["char_obj"]
-                    logger.debug(f"Processing character U+{code_point_hex}: {data['name']}")
-                    if char == "\n":
-                        char = "\\n"
-                    elif char == "\r":
-                        char = "\\r"
-                    elif char == "\t":
-                        char = "\\t"
-                    elif char == '"':
-                        char = '\\"'
-                    elif char == "\\":
-                        char = "\\\\"
-                    elif ord(char) < 32:  # Other control characters
-                        char = f"\\{ord(char):03d}"
-
-                    # Helper function to properly escape Lua strings
-                    def escape_lua_string(s):
-                        # First escape backslashes
-                        s = s.replace("\\", "\\\\")
-                        # Then escape other special characters
-                        s = s.replace('"', '\\"')
-                        s = s.replace("\n", "\\n")
-                        s = s.replace("\r", "\\r")
-                        s = s.replace("\t", "\\t")
-                        # Replace any other control characters
-                        result = ""
-                        for c in s:
-                            if ord(c) < 32 and c not in "\n\r\t":
-                                result += f"\\{ord(c):03d}"
-                            else:
-                                result += c
-                        return result
+                    char = escape_lua_string(data["char_obj"])
+                    if debug_enabled:
+                        logger.debug(
+                            f"Processing character U+{code_point_hex}: {data['name']}"
+                        )
 
                     # Escape special characters in all string fields
                     name = escape_lua_string(data["name"])
                     category = escape_lua_string(data["category"])
                     block = escape_lua_string(data.get("block", "Unknown Block"))
 
-                    f.write("  {\n")
-                    f.write(f'    code_point = "U+{code_point_hex}",\n')
-                    f.write(f'    character = "{char}",\n')
-                    f.write(f'    name = "{name}",\n')
-                    f.write(f'    category = "{category}",\n')
-                    f.write(f'    block = "{block}",\n')
-
-                    # Write aliases as a Lua table
+                    # Write aliases as a Lua table, using the same escaping
                     if aliases:
-                        f.write("    aliases = {\n")
-                        for alias in aliases:
-                            # Use the same escaping function for aliases
-                            escaped_alias = escape_lua_string(alias)
-                            f.write(f'      "{escaped_alias}",\n')
-                        f.write("    },\n")
+                        lua_aliases = "".join(
+                            [
+                                f'      "{escape_lua_string(alias)}",\n'
+                                for alias in aliases
+                            ]
+                        )
+                        lua_aliases = f"{{\n{lua_aliases}    }}"
                     else:
-                        f.write("    aliases = {},\n")
-
-                    f.write("  },\n")
+                        lua_aliases = "{}"
+
+                    # Build the whole table and write it at once
+                    f.write(
+                        "  {\n"
+                        f'    code_point = "U+{code_point_hex}",\n'
+                        f'    character = "{char}",\n'
+                        f'    name = "{name}",\n'
+                        f'    category = "{category}",\n'
+                        f'    block = "{block}",\n'
+                        f"    aliases = {lua_aliases},\n"
+                        "  },\n"
+                    )
 
                 f.write("}\n")
             logger.debug(f"Successfully wrote Lua module to {output_filename}")
@@ -3,6 +3,8 @@ Registry for exporters.
 """
 
 import logging
+from collections.abc import Mapping
+from types import MappingProxyType
 
 logger = logging.getLogger('uniff')
 
@@ -18,6 +20,8 @@ class ExporterRegistry:
     def __init__(self):
         """Initialize an empty registry."""
         self._exporters = {}
+        # Read-only view handed out by get_all_exporters
+        self._exporters_view = MappingProxyType(self._exporters)
 
     def register(self, exporter) -> None:
         """
@@ -48,15 +52,17 @@ class ExporterRegistry:
             logger.debug(f"Found exporter for format: {format_type}")
         return exporter
 
-    def get_all_exporters(self) -> dict[str, object]:
+    def get_all_exporters(self) -> Mapping[str, object]:
         """
         Get all registered exporters.
 
         Returns:
-            A dictionary mapping format types to exporters
+            A live, read-only mapping of format types to exporters
         """
-        exporters = self._exporters.copy()
-        logger.debug(f"Retrieved all exporters: {', '.join(exporters.keys())}")
+        exporters = self._exporters_view
+        # Only join the names when the message is logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Retrieved all exporters: {', '.join(exporters.keys())}")
         return exporters
 
     def get_supported_formats(self) -> list[str]:
@@ -67,5 +73,6 @@ class ExporterRegistry:
             A list of all format types that have registered exporters
         """
         formats = list(self._exporters.keys())
-        logger.debug(f"Supported formats: {', '.join(formats)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Supported formats: {', '.join(formats)}")
         return formats
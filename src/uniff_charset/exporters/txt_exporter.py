@@ -62,6 +62,8 @@ class TxtExporter(BaseExporter):
         try:
             with open(output_filename, "w", encoding="utf-8") as f:
                 logger.debug("Writing characters in pipe-separated format")
+                # Only format the per-character messages when they are logged
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
                 for code_point_hex, data in unicode_data.items():
                     # Format: character|name|code_point|category|block|alias1|alias2|...
                     # Optimized for grep with searchable fields first
@@ -82,7 +84,10 @@ class TxtExporter(BaseExporter):
                     # Join with pipe separator
                     line = "|".join(line_parts)
                     f.write(line + "\n")
-                    logger.debug(f"Wrote entry for U+{code_point_hex}: {data['name']}")
+                    if debug_enabled:
+                        logger.debug(
+                            f"Wrote entry for U+{code_point_hex}: {data['name']}"
+                        )
             logger.debug(f"Successfully wrote text file to {output_filename}")
             return True
         except Exception as e:
@@ -2,16 +2,18 @@
 Module for retrieving raw Unicode data files.
 """
 
+import json
 import logging
 import os
 import shutil
 import tempfile
-from typing import Optional
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
 import requests
-from uniff_core.types import FetchOptions
 
-logger = logging.getLogger('uniff')
+from uniff_core.types import FetchOptions
 
 from .config import (
     CLDR_ANNOTATIONS_URL,
@@ -22,15 +24,55 @@ from .config import (
     UNICODE_DATA_FILE_URL,
     USER_AGENT,
 )
+from .types import FetchResult
+
+logger = logging.getLogger('uniff')
+
+# Size of the chunks a download is read and written in. Large chunks keep the
+# number of read and write calls per file small
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Shared by all downloads, so connections to the same host are kept alive and
+# reused instead of each request setting up its own TCP and TLS session. Its
+# connection pool is safe to use from the concurrent download threads
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = USER_AGENT  # Avoids rate limiting
 
 
-def download_file(url: str, options: FetchOptions) -> Optional[str]:
+def _resolve_cache_dir(options: FetchOptions) -> Optional[str]:
+    """
+    Determine which cache directory the fetch options refer to.
+
+    Args:
+        options: Fetch options including cache settings
+
+    Returns:
+        The cache directory, or None if there is none
+    """
+    if options.use_temp_cache:
+        return TMP_CACHE_DIR
+    if not options.cache_dir and options.use_cache:
+        return DEFAULT_CACHE_DIR
+    return options.cache_dir
+
+
+def download_file(
+    url: str,
+    options: FetchOptions,
+    on_download: Optional[Callable[[str], None]] = None,
+) -> Optional[str]:
     """
     Download a file from a URL to a temporary file and return its path.
 
+    Cached files are used as they are, unless options.revalidate is set. Then
+    the ETag or Last-Modified saved with the cached copy is sent in a
+    conditional request, and the file is only downloaded again if it changed.
+
     Args:
         url: URL to download from
         options: Fetch options including cache settings
+        on_download: Called with the file path after a fresh download (not for
+            files served from the cache, including revalidated ones)
 
     Returns:
         Path to the downloaded file, or None if download failed
@@ -38,112 +80,191 @@ def download_file(url: str, options: FetchOptions) -> Optional[str]:
     # Extract the filename from the URL
     filename = os.path.basename(url)
 
-    # Determine which cache directory to use
-    cache_dir = options.cache_dir
-    if options.use_temp_cache:
-        cache_dir = TMP_CACHE_DIR
-    elif not cache_dir and options.use_cache:
-        cache_dir = DEFAULT_CACHE_DIR
+    cache_dir = _resolve_cache_dir(options)
 
     # If cache is enabled, check if the file exists in the cache directory
-    if options.use_cache and cache_dir:
+    caching = bool(options.use_cache and cache_dir)
+    conditional_headers = {}
+    if caching:
         cache_path = os.path.join(cache_dir, filename)
+        # Validators of the cached copy, saved next to it
+        validators_path = cache_path + ".etag"
         if os.path.exists(cache_path):
-            logger.debug(f"Using cached file: {cache_path}")
-            return cache_path
+            if options.revalidate:
+                conditional_headers = read_validators(validators_path)
+            if not conditional_headers:
+                logger.debug(f"Using cached file: {cache_path}")
+                return cache_path
     try:
-        # Create a temporary file in the system's temp directory
-        temp_dir = tempfile.gettempdir()
-        temp_file_path = os.path.join(temp_dir, f"uniff-gen-{filename}")
+        if caching:
+            os.makedirs(cache_dir, exist_ok=True)
+            file_path = cache_path
+        else:
+            # Without a cache, files go to the system's temp directory
+            temp_dir = tempfile.gettempdir()
+            file_path = os.path.join(temp_dir, f"uniff-gen-{filename}")
+
+        # Download to a partial file next to the destination and rename it into
+        # place. The rename is atomic, so the destination never holds a partially
+        # downloaded file, and the process ID keeps concurrent runs from writing
+        # to the same partial file
+        part_path = f"{file_path}.{os.getpid()}.part"
 
-        # Add a user agent to avoid rate limiting
-        headers = {"User-Agent": USER_AGENT}
         logger.debug(f"Downloading file from {url}")
 
         try:
-            response = requests.get(url, stream=True, headers=headers)
-            response.raise_for_status()
-
-            with open(temp_file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            # If cache is enabled, save the file to the cache directory
-            if options.use_cache and cache_dir:
-                os.makedirs(cache_dir, exist_ok=True)
-                cache_path = os.path.join(cache_dir, filename)
-                shutil.copy2(temp_file_path, cache_path)
-                logger.debug(f"Saved file to cache: {cache_path}")
-                # Clean up the temporary file
-                os.unlink(temp_file_path)
-                return cache_path
+            response = _SESSION.get(url, stream=True, headers=conditional_headers)
+            try:
+                # Only sent with the validators of a cached copy
+                if conditional_headers and response.status_code == 304:
+                    logger.debug(f"Cached file not modified: {file_path}")
+                    return file_path
 
-            logger.debug(f"Saved file to temporary location: {temp_file_path}")
-            return temp_file_path
+                response.raise_for_status()
+
+                with open(part_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            finally:
+                # Return the connection to the pool
+                response.close()
+
+            os.replace(part_path, file_path)
+            if caching:
+                # Saved so the cached copy can be revalidated later
+                write_validators(validators_path, response.headers)
+                logger.debug(f"Saved file to cache: {file_path}")
+            else:
+                logger.debug(f"Saved file to temporary location: {file_path}")
+            if on_download:
+                on_download(file_path)
+            return file_path
         except (requests.exceptions.RequestException, Exception) as e:
             logger.debug(f"Error downloading file {url}: {str(e)}")
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            if os.path.exists(part_path):
+                os.unlink(part_path)
+            if conditional_headers:
+                # The cached copy is still usable when revalidating it fails
+                logger.debug(f"Using cached file after failed revalidation: {file_path}")
+                return file_path
             return None
     except Exception:
         return None
-        return None
 
 
-def fetch_all_data_files(options: FetchOptions) -> dict[str, str]:
+def read_validators(validators_path: str) -> dict[str, str]:
+    """
+    Read the conditional request headers saved for a previous download.
+
+    Args:
+        validators_path: Path to the file written by write_validators
+
+    Returns:
+        Dictionary of If-None-Match/If-Modified-Since headers, empty if none
+        were saved
+    """
+    try:
+        with open(validators_path, encoding="utf-8") as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return validators if isinstance(validators, dict) else {}
+
+
+def write_validators(validators_path: str, response_headers: Mapping[str, str]) -> None:
+    """
+    Save the ETag and Last-Modified of a download for later conditional requests.
+
+    Args:
+        validators_path: Path to save the validators to
+        response_headers: Headers of the download's response
+    """
+    validators = {}
+    if "ETag" in response_headers:
+        validators["If-None-Match"] = response_headers["ETag"]
+    if "Last-Modified" in response_headers:
+        validators["If-Modified-Since"] = response_headers["Last-Modified"]
+
+    try:
+        if validators:
+            with open(validators_path, "w", encoding="utf-8") as f:
+                json.dump(validators, f)
+        elif os.path.exists(validators_path):
+            # Validators of an older copy must not be sent for this one
+            os.unlink(validators_path)
+    except OSError as e:
+        logger.debug(f"Could not save validators to {validators_path}: {e}")
+
+
+def fetch_all_data_files(
+    options: FetchOptions,
+    on_download: Optional[Callable[[str, str], None]] = None,
+) -> FetchResult:
     """
     Fetch all required Unicode data files.
 
     Args:
         options: Fetch options including cache settings
+        on_download: Called with (file_type, path) as soon as each file has been
+            freshly downloaded, so callers can start processing it while the
+            remaining files are still downloading. It is called from the
+            downloading thread, so it must be thread-safe
 
     Returns:
-        Dictionary mapping file types to file paths:
+        FetchResult whose paths map file types to file paths:
         {
             'unicode_data': path_to_unicode_data_file,
             'name_aliases': path_to_name_aliases_file,
             'names_list': path_to_names_list_file,
             'cldr_annotations': path_to_cldr_annotations_file
         }
-        Empty dictionary if any required file failed to download
+        and whose from_cache records, per file type, whether the file was served
+        from the cache. Empty if any required file failed to download
     """
     result = {}
+    downloaded = set()
     logger.debug("Starting download of Unicode data files")
 
-    # Download UnicodeData.txt
-    logger.debug("Downloading UnicodeData.txt")
-    unicode_data_file = download_file(UNICODE_DATA_FILE_URL, options)
-    if unicode_data_file:
-        result["unicode_data"] = unicode_data_file
-    else:
-        return {}
+    def notify(file_type: str) -> Callable[[str], None]:
+        def on_file_downloaded(path: str) -> None:
+            downloaded.add(file_type)
+            if on_download:
+                on_download(file_type, path)
 
-    # Download NameAliases.txt
-    logger.debug("Downloading NameAliases.txt")
-    name_aliases_file = download_file(NAME_ALIASES_FILE_URL, options)
-    if name_aliases_file:
-        result["name_aliases"] = name_aliases_file
-    else:
-        return {}
+        return on_file_downloaded
 
-    # Download NamesList.txt
-    logger.debug("Downloading NamesList.txt")
-    names_list_file = download_file(NAMES_LIST_FILE_URL, options)
-    if names_list_file:
-        result["names_list"] = names_list_file
-    else:
-        return {}
+    # The downloads spend most of their time waiting on the network, so run them
+    # in threads to overlap their latency
+    data_file_urls = {
+        "unicode_data": UNICODE_DATA_FILE_URL,
+        "name_aliases": NAME_ALIASES_FILE_URL,
+        "names_list": NAMES_LIST_FILE_URL,
+        "cldr_annotations": CLDR_ANNOTATIONS_URL,
+    }
+    with ThreadPoolExecutor(max_workers=len(data_file_urls)) as executor:
+        futures = {
+            file_type: executor.submit(download_file, url, options, notify(file_type))
+            for file_type, url in data_file_urls.items()
+        }
+
+    for file_type, future in futures.items():
+        path = future.result()
+        if path:
+            result[file_type] = path
+        elif file_type == "cldr_annotations":
+            # CLDR annotations are optional
+            logger.debug("CLDR annotations download failed (optional)")
+        else:
+            logger.debug(f"Required data file {file_type} failed to download")
+            return FetchResult()
 
-    # Download CLDR annotations (optional)
-    logger.debug("Downloading CLDR annotations")
-    cldr_annotations_file = download_file(CLDR_ANNOTATIONS_URL, options)
-    if cldr_annotations_file:
-        result["cldr_annotations"] = cldr_annotations_file
+    if "cldr_annotations" in result:
         logger.debug("Successfully downloaded all data files")
-    else:
-        logger.debug("CLDR annotations download failed (optional)")
 
-    return result
+    return FetchResult(
+        paths=result,
+        from_cache={file_type: file_type not in downloaded for file_type in result},
+    )
 
 
 def clean_cache(options: FetchOptions) -> None:
@@ -153,12 +274,7 @@ def clean_cache(options: FetchOptions) -> None:
     Args:
         options: Fetch options including cache settings
     """
-    # Determine which cache directory to clean
-    cache_dir = options.cache_dir
-    if options.use_temp_cache:
-        cache_dir = TMP_CACHE_DIR
-    elif not cache_dir and options.use_cache:
-        cache_dir = DEFAULT_CACHE_DIR
+    cache_dir = _resolve_cache_dir(options)
 
     if cache_dir and os.path.exists(cache_dir):
         logger.debug(f"Cleaning cache directory: {cache_dir}")
@@ -2,12 +2,18 @@
 Module for processing Unicode data files.
 """
 
+import dataclasses
+import functools
 import hashlib
 import json
 import logging
 import os
+import sys
+import time
 import xml.etree.ElementTree as ElementTree
+from array import array
 from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from typing import Any, Optional
 
 from .config import (
@@ -16,6 +22,8 @@ from .config import (
     ALIAS_SOURCE_INFORMATIVE,
     DATASET_COMPLETE,
     DATASET_TEST,
+    DEFAULT_DATA_DIR,
+    MASTER_DATA_FILE,
     get_alias_sources,
     get_dataset_blocks,
     get_unicode_blocks,
@@ -23,6 +31,75 @@ from .config import (
 
 logger = logging.getLogger("uniff")
 
+# Try to import orjson for faster master file saving and loading, but fall back
+# to the json module
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Number of Unicode code points, and of code points per page of the block tables
+CODE_POINT_COUNT = 0x110000
+BLOCK_PAGE_BITS = 8
+BLOCK_PAGE_SIZE = 1 << BLOCK_PAGE_BITS
+
+
+def build_block_tables(
+    unicode_blocks: dict[range, str],
+) -> tuple[array, array, list[str]]:
+    """
+    Build two-stage lookup tables mapping code points to Unicode block names.
+
+    The code points are split into pages of BLOCK_PAGE_SIZE. The first table
+    holds, for each page, the offset of its block IDs in the second table, where
+    identical pages (most of them outside any block) are stored only once.
+
+    Args:
+        unicode_blocks: Dictionary mapping code point ranges to block names
+
+    Returns:
+        Tuple of (page offsets, block IDs, block names by ID), where block ID 0
+        is "Unknown Block"
+    """
+    block_names = ["Unknown Block", *unicode_blocks.values()]
+
+    # Block ID of every code point. Blocks are filled in reverse, so where
+    # ranges overlap the first block listed wins, as it would in a linear scan
+    block_ids = array("H", bytes(2 * CODE_POINT_COUNT))
+    for block_id, block_range in reversed(list(enumerate(unicode_blocks, 1))):
+        start = max(block_range.start, 0)
+        stop = min(block_range.stop, CODE_POINT_COUNT)
+        if start < stop:
+            block_ids[start:stop] = array("H", [block_id]) * (stop - start)
+
+    page_offsets = array("I")
+    pages = array("H")
+    offsets_by_page = {}
+    for page_start in range(0, CODE_POINT_COUNT, BLOCK_PAGE_SIZE):
+        page = block_ids[page_start : page_start + BLOCK_PAGE_SIZE].tobytes()
+        offset = offsets_by_page.get(page)
+        if offset is None:
+            offset = offsets_by_page[page] = len(pages)
+            pages.frombytes(page)
+        page_offsets.append(offset)
+
+    return page_offsets, pages, block_names
+
+
+@functools.lru_cache(maxsize=1)
+def get_block_tables() -> tuple[array, array, list[str]]:
+    """
+    Get the block lookup tables for the blocks in config.yaml, built once.
+
+    Returns:
+        Tuple of (page offsets, block IDs, block names by ID), as returned by
+        build_block_tables
+    """
+    return build_block_tables(get_unicode_blocks())
+
 
 def get_unicode_block(code_point: int) -> str:
     """
@@ -34,13 +111,11 @@ def get_unicode_block(code_point: int) -> str:
     Returns:
         Name of the Unicode block, or "Unknown Block" if not found
     """
-    unicode_blocks = get_unicode_blocks()
-    for block_range, block_name in unicode_blocks.items():
-        if code_point in block_range:
-            logger.debug(f"Code point {hex(code_point)} belongs to block '{block_name}'")
-            return block_name
-    logger.debug(f"No block found for code point {hex(code_point)}")
-    return "Unknown Block"
+    page_offsets, pages, block_names = get_block_tables()
+    if not 0 <= code_point < CODE_POINT_COUNT:
+        return block_names[0]
+    offset = page_offsets[code_point >> BLOCK_PAGE_BITS]
+    return block_names[pages[offset + (code_point & (BLOCK_PAGE_SIZE - 1))]]
 
 
 def parse_unicode_data(filename: str) -> dict[str, dict[str, str]]:
@@ -55,33 +130,48 @@ def parse_unicode_data(filename: str) -> dict[str, dict[str, str]]:
         {code_point_hex: {'name': name, 'category': category, 'char_obj': char}}
     """
     data = {}
+    page_offsets, pages, block_names = get_block_tables()
+    # Only format the per-character messages when they are logged
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
     try:
         with open(filename, encoding="utf-8") as f:
             for line in f:
-                fields = line.strip().split(";")
+                # Only the first three fields are used, so the rest of the line is
+                # left unsplit
+                fields = line.strip().split(";", 3)
                 if len(fields) >= 3:
                     code_point_hex = fields[0]
                     name = fields[1]
-                    category = fields[2]
 
-                    if name.startswith("<") and name.endswith(", First>"):
-                        continue
-                    if name.startswith("<") and name.endswith(", Last>"):
+                    # Skip the markers of ranges whose characters are not listed
+                    if name.startswith("<") and name.endswith((", First>", ", Last>")):
                         continue
 
+                    # Share one string per category between all characters
+                    category = sys.intern(fields[2])
+
                     try:
-                        char_obj = chr(int(code_point_hex, 16))
-                        block = get_unicode_block(int(code_point_hex, 16))
+                        code_point = int(code_point_hex, 16)
+                        char_obj = chr(code_point)
+                        # Same lookup as get_unicode_block, with the tables fetched
+                        # once. chr has already rejected code points out of range
+                        block = block_names[
+                            pages[
+                                page_offsets[code_point >> BLOCK_PAGE_BITS]
+                                + (code_point & (BLOCK_PAGE_SIZE - 1))
+                            ]
+                        ]
                         data[code_point_hex] = {
                             "name": name,
                             "category": category,
                             "char_obj": char_obj,
                             "block": block,
                         }
-                        logger.debug(
-                            f"Parsed character {code_point_hex}: {name}"
-                            f"({category}) in block {block}"
-                        )
+                        if debug_enabled:
+                            logger.debug(
+                                f"Parsed character {code_point_hex}: {name}"
+                                f"({category}) in block {block}"
+                            )
                     except ValueError:
                         logger.debug(
                             f"Skipping invalid code point: {code_point_hex} - {name}"
@@ -204,31 +294,28 @@ def parse_cldr_annotations(filename: str) -> dict[str, list[str]]:
     cldr_annotations = defaultdict(list)
 
     try:
-        tree = ElementTree.parse(filename)
-        root = tree.getroot()
-
-        # Find all annotation elements
-        for annotation in root.findall(".//annotation"):
-            # Skip text-to-speech annotations (type="tts")
-            if "type" in annotation.attrib:
+        # Stream the file and clear each element once it has been handled, so the
+        # full document tree is never held in memory
+        for _, element in ElementTree.iterparse(filename, events=("end",)):
+            if element.tag != "annotation":
+                element.clear()
                 continue
 
-            # Get the character code point
-            if "cp" in annotation.attrib:
-                char = annotation.attrib["cp"]
-                # Convert character to code point
-                if len(char) == 1:
-                    code_point_hex = format(ord(char), "X")
-                else:
-                    # Handle multi-character code points
-                    code_point_hex = format(ord(char[0]), "X")
+            # Skip text-to-speech annotations (type="tts")
+            attrib = element.attrib
+            if "type" not in attrib and "cp" in attrib:
+                # Convert the character (or first character of a sequence) to a
+                # code point
+                code_point_hex = format(ord(attrib["cp"][0]), "X")
 
                 # Get the annotations (pipe-separated list)
-                if annotation.text:
+                if element.text:
                     # Split by pipe and strip whitespace
-                    aliases = [alias.strip() for alias in annotation.text.split("|")]
+                    aliases = [alias.strip() for alias in element.text.split("|")]
                     cldr_annotations[code_point_hex].extend(aliases)
 
+            element.clear()
+
         return cldr_annotations
     except FileNotFoundError:
         print(f"Error: {filename} not found.")
@@ -248,17 +335,34 @@ def normalize_alias(alias: str) -> str:
     Returns:
         Normalized alias string
     """
-    return alias.lower().strip()
+    return alias.strip().lower()
+
+
+def normalize_aliases(aliases: Iterable[str]) -> Iterator[str]:
+    """
+    Normalize aliases in bulk, the same way as normalize_alias.
+
+    Args:
+        aliases: The aliases to normalize
+
+    Returns:
+        Iterator over the normalized aliases
+    """
+    # Chained maps over the str methods avoid a Python call per alias
+    return map(str.lower, map(str.strip, aliases))
 
 
 def process_data_files(
     file_paths: dict[str, str],
+    unicode_data: Optional[dict[str, dict[str, str]]] = None,
 ) -> tuple[dict[str, dict[str, str]], dict[str, list[str]]]:
     """
     Process Unicode data files.
 
     Args:
         file_paths: Dictionary mapping file types to file paths
+        unicode_data: Already parsed UnicodeData.txt contents (optional), e.g.
+            parsed while the other files were downloading
 
     Returns:
         Tuple of (unicode_data, aliases_data) where:
@@ -267,7 +371,8 @@ def process_data_files(
     """
     # Parse the Unicode data files
     logger.debug("Starting Unicode data file processing")
-    unicode_data = parse_unicode_data(file_paths["unicode_data"])
+    if unicode_data is None:
+        unicode_data = parse_unicode_data(file_paths["unicode_data"])
     if unicode_data is None:
         logger.debug("Failed to parse Unicode data file")
         return None, {}
@@ -289,34 +394,27 @@ def process_data_files(
         cldr_annotations = parse_cldr_annotations(file_paths["cldr_annotations"])
 
     # Merge aliases with deduplication
-    aliases_data = defaultdict(list)
     alias_sets = defaultdict(set)  # Use sets for deduplication
 
     # Process and add formal aliases if configured
     if ALIAS_SOURCE_FORMAL in alias_sources:
         for code_point, aliases in formal_aliases.items():
-            for alias in aliases:
-                normalized_alias = normalize_alias(alias)
-                alias_sets[code_point].add(normalized_alias)
+            alias_sets[code_point].update(normalize_aliases(aliases))
 
     # Process and add informative aliases if configured
     if ALIAS_SOURCE_INFORMATIVE in alias_sources:
         for code_point, aliases in informative_aliases.items():
-            code_point_hex = code_point.upper()
-            for alias in aliases:
-                normalized_alias = normalize_alias(alias)
-                alias_sets[code_point_hex].add(normalized_alias)
+            alias_sets[code_point.upper()].update(normalize_aliases(aliases))
 
     # Process and add CLDR annotations if configured
     if ALIAS_SOURCE_CLDR in alias_sources:
         for code_point, annotations in cldr_annotations.items():
-            for annotation in annotations:
-                normalized_alias = normalize_alias(annotation)
-                alias_sets[code_point].add(normalized_alias)
+            alias_sets[code_point].update(normalize_aliases(annotations))
 
     # Convert sets back to lists for compatibility with the rest of the codebase
-    for code_point, alias_set in alias_sets.items():
-        aliases_data[code_point] = sorted(alias_set)
+    aliases_data = {
+        code_point: sorted(alias_set) for code_point, alias_set in alias_sets.items()
+    }
 
     return unicode_data, aliases_data
 
@@ -393,14 +491,18 @@ def filter_by_unicode_blocks(
     if "all" in blocks:
         return unicode_data, aliases_data
 
-    filtered_unicode_data = {}
-    filtered_aliases_data = {}
-
-    for code_point, char_info in unicode_data.items():
-        if "block" in char_info and char_info["block"] in blocks:
-            filtered_unicode_data[code_point] = char_info
-            if code_point in aliases_data:
-                filtered_aliases_data[code_point] = aliases_data[code_point]
+    # Hash lookups instead of scanning the block list for every character
+    block_set = frozenset(blocks)
+    filtered_unicode_data = {
+        code_point: char_info
+        for code_point, char_info in unicode_data.items()
+        if char_info.get("block") in block_set
+    }
+    filtered_aliases_data = {
+        code_point: aliases_data[code_point]
+        for code_point in filtered_unicode_data
+        if code_point in aliases_data
+    }
 
     return filtered_unicode_data, filtered_aliases_data
 
@@ -418,17 +520,12 @@ def save_master_data_file(
     If file_paths or checksum is provided, the filename will include a checksum
     to enable caching and reuse of processed data.
 
-    If file_paths or checksum is provided, the filename will include a checksum
-    to enable caching and reuse of processed data.
-
     Args:
         unicode_data: Dictionary mapping code points to character information
         aliases_data: Dictionary mapping code points to lists of aliases
         data_dir: Directory to save the master data file
         file_paths: Dictionary mapping file types to file paths (optional)
         checksum: Pre-calculated checksum string (optional)
-        file_paths: Dictionary mapping file types to file paths (optional)
-        checksum: Pre-calculated checksum string (optional)
 
     Returns:
         Path to the saved master data file, or None if saving failed
@@ -441,18 +538,6 @@ def save_master_data_file(
         os.makedirs(data_dir, exist_ok=True)
         logger.debug(f"Saving master data file to {data_dir}")
 
-        # Prepare the data for serialization
-        master_data = {"unicode_data": {}, "aliases_data": aliases_data}
-
-        # Convert UnicodeCharInfo objects to dictionaries
-        for code_point, char_info in unicode_data.items():
-            master_data["unicode_data"][code_point] = {
-                "name": char_info["name"],
-                "category": char_info["category"],
-                "char_obj": char_info["char_obj"],
-                "block": char_info.get("block", "Unknown Block"),
-            }
-
         # Determine the master file path based on checksum if available
         if checksum or file_paths:
             # Get a file path that includes the checksum
@@ -463,27 +548,28 @@ def save_master_data_file(
             )
         else:
             # Use the default master file path
-            from .config import MASTER_DATA_FILE
-
             master_file_path = os.path.join(data_dir, MASTER_DATA_FILE)
 
-        # Determine the master file path based on checksum if available
-        if checksum or file_paths:
-            # Get a file path that includes the checksum
-            master_file_path = get_master_file_path(
-                fetch_options=type("FetchOptions", (), {"data_dir": data_dir})(),
-                file_paths=file_paths,
-                checksum=checksum,
-            )
+        # Save the data to the master file. The character dictionaries already
+        # have the fields of the file format, so they are serialized as they are
+        master_data = {"unicode_data": unicode_data, "aliases_data": aliases_data}
+        if ORJSON_AVAILABLE:
+            with open(master_file_path, "wb") as f:
+                f.write(orjson.dumps(master_data, option=orjson.OPT_INDENT_2))
         else:
-            # Use the default master file path
-            from .config import MASTER_DATA_FILE
-
-            master_file_path = os.path.join(data_dir, MASTER_DATA_FILE)
-
-        # Save the data to the master file
-        with open(master_file_path, "w", encoding="utf-8") as f:
-            json.dump(master_data, f, ensure_ascii=False, indent=2)
+            with open(master_file_path, "w", encoding="utf-8") as f:
+                json.dump(master_data, f, ensure_ascii=False, indent=2)
+
+        # Save a small sidecar so callers can get the counts without loading the
+        # master file
+        meta = {
+            "char_count": len(unicode_data),
+            "aliases_count": len(aliases_data),
+            "checksum": checksum,
+            "created": int(time.time()),
+        }
+        with open(get_master_meta_path(master_file_path), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
 
         logger.debug(f"Successfully saved master data file: {master_file_path}")
         logger.debug(
@@ -515,8 +601,12 @@ def load_master_data_file(
             return None, None
 
         # Load the data from the master file
-        with open(master_file_path, encoding="utf-8") as f:
-            master_data = json.load(f)
+        if ORJSON_AVAILABLE:
+            with open(master_file_path, "rb") as f:
+                master_data = orjson.loads(f.read())
+        else:
+            with open(master_file_path, encoding="utf-8") as f:
+                master_data = json.load(f)
 
         # Extract the unicode_data and aliases_data
         unicode_data_dict = master_data.get("unicode_data", {})
@@ -525,6 +615,15 @@ def load_master_data_file(
         # Convert dictionaries to UnicodeCharInfo objects
         unicode_data = unicode_data_dict
 
+        # The JSON decoder creates a new string for every value, but there are
+        # only a few dozen categories and a few hundred blocks; interning them
+        # lets all characters share one string per value
+        for char_info in unicode_data.values():
+            if "category" in char_info:
+                char_info["category"] = sys.intern(char_info["category"])
+            if "block" in char_info:
+                char_info["block"] = sys.intern(char_info["block"])
+
         total_aliases = sum(len(aliases) for aliases in aliases_data.values())
         logger.debug(f"Loaded master data file: {master_file_path}")
         logger.debug(f"Loaded {len(unicode_data)} characters and {total_aliases} aliases")
@@ -539,6 +638,41 @@ def load_master_data_file(
         return None, None
 
 
+def get_master_meta_path(master_file_path: str) -> str:
+    """
+    Get the path of the metadata sidecar for a master data file.
+
+    Args:
+        master_file_path: Path to the master data file
+
+    Returns:
+        Path to the sidecar file
+    """
+    return f"{master_file_path}.meta.json"
+
+
+def load_master_meta(master_file_path: str) -> Optional[dict[str, Any]]:
+    """
+    Load the metadata sidecar for a master data file.
+
+    Args:
+        master_file_path: Path to the master data file
+
+    Returns:
+        Dictionary with char_count, aliases_count, checksum and created, or None if
+        the sidecar is missing or invalid
+    """
+    try:
+        with open(get_master_meta_path(master_file_path), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(meta, dict) or "char_count" not in meta:
+        return None
+    return meta
+
+
 def get_master_file_path(
     fetch_options,
     file_paths: Optional[dict[str, str]] = None,
@@ -562,8 +696,6 @@ def get_master_file_path(
     Returns:
         Path to the master data file
     """
-    from .config import DEFAULT_DATA_DIR, MASTER_DATA_FILE
-
     # Determine which data directory to use
     data_dir = fetch_options.data_dir
     if not data_dir:
@@ -580,19 +712,6 @@ def get_master_file_path(
 
     return os.path.join(data_dir, master_filename)
 
-    # Create a filename with the checksum if we have file paths or a checksum
-    if checksum:
-        master_filename = f"unicode_master_data_{checksum}.json"
-    elif file_paths:
-        calculated_checksum = calculate_source_files_checksum(file_paths)
-        master_filename = f"unicode_master_data_{calculated_checksum}.json"
-    else:
-        master_filename = MASTER_DATA_FILE
-
-    # Return the path to the master data file
-    return os.path.join(data_dir, master_filename)
-    return os.path.join(data_dir, master_filename)
-
 
 def calculate_alias_statistics(aliases_data: dict[str, list[str]]) -> dict[str, Any]:
     """
@@ -630,20 +749,21 @@ def calculate_alias_statistics(aliases_data: dict[str, list[str]]) -> dict[str,
     total_aliases = sum(alias_counts)
     avg_aliases_per_char = total_aliases / total_characters if total_characters > 0 else 0
 
-    # Calculate median
-    sorted_counts = sorted(alias_counts)
-    mid = len(sorted_counts) // 2
-    if len(sorted_counts) % 2 == 0:
-        median_aliases_per_char = (sorted_counts[mid - 1] + sorted_counts[mid]) / 2
+    # Calculate median. The list is sorted in place, which also gives the min and
+    # max at its ends
+    alias_counts.sort()
+    mid = len(alias_counts) // 2
+    if len(alias_counts) % 2 == 0:
+        median_aliases_per_char = (alias_counts[mid - 1] + alias_counts[mid]) / 2
     else:
-        median_aliases_per_char = sorted_counts[mid]
+        median_aliases_per_char = alias_counts[mid]
 
     # Find min and max
-    max_aliases = max(alias_counts) if alias_counts else 0
-    min_aliases = min(alias_counts) if alias_counts else 0
+    max_aliases = alias_counts[-1]
+    min_aliases = alias_counts[0]
 
     # Count characters with no aliases
-    chars_with_no_aliases = sum(1 for count in alias_counts if count == 0)
+    chars_with_no_aliases = alias_counts.count(0)
 
     return {
         "total_characters": total_characters,
@@ -656,6 +776,10 @@ def calculate_alias_statistics(aliases_data: dict[str, list[str]]) -> dict[str,
     }
 
 
+# Size of the chunks files are hashed in when hashlib.file_digest is unavailable
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+
 def calculate_file_checksum(file_path: str) -> str:
     """
     Calculate MD5 checksum of a file.
@@ -669,9 +793,13 @@ def calculate_file_checksum(file_path: str) -> str:
     if not os.path.exists(file_path):
         return ""
 
-    hash_md5 = hashlib.md5()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        # file_digest (Python 3.11+) hashes the whole file in C
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "md5").hexdigest()
+
+        hash_md5 = hashlib.md5()
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
             hash_md5.update(chunk)
     return hash_md5.hexdigest()
 
@@ -680,19 +808,44 @@ def calculate_source_files_checksum(file_paths: dict[str, str]) -> str:
     """
     Calculate a combined checksum of all source files.
 
+    Results are memoized on each file's path, modification time and size, so
+    unchanged files are only hashed once per process.
+
     Args:
         file_paths: Dictionary mapping file types to file paths
 
     Returns:
         Combined MD5 checksum as a hexadecimal string
     """
+    fingerprints = []
     # Sort the file types to ensure a consistent order
-    file_types = sorted(file_paths.keys())
+    for file_type in sorted(file_paths.keys()):
+        file_path = file_paths[file_type]
+        try:
+            stat = os.stat(file_path)
+            fingerprints.append((file_type, file_path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            fingerprints.append((file_type, file_path, None, None))
+
+    return _calculate_source_files_checksum(tuple(fingerprints))
+
+
+@functools.lru_cache(maxsize=32)
+def _calculate_source_files_checksum(
+    fingerprints: tuple[tuple[str, str, Optional[int], Optional[int]], ...],
+) -> str:
+    """
+    Calculate a combined checksum from (file_type, path, mtime_ns, size) tuples.
 
+    Args:
+        fingerprints: File fingerprints sorted by file type
+
+    Returns:
+        Combined MD5 checksum as a hexadecimal string
+    """
     # Calculate checksums for each file
     checksums = []
-    for file_type in file_types:
-        file_path = file_paths[file_type]
+    for file_type, file_path, _, _ in fingerprints:
         checksum = calculate_file_checksum(file_path)
         checksums.append(f"{file_type}:{checksum}")
 
@@ -715,14 +868,173 @@ def find_master_file_by_checksum(data_dir: str, checksum: str) -> Optional[str]:
     Returns:
         Path to the master file if found, None otherwise
     """
-    if not os.path.exists(data_dir):
-        return None
-
-    # Look for a file with the checksum in its name
+    # The checksum is part of the file name, so the lookup is a single stat of
+    # the expected path rather than a scan of the data directory
     master_filename = f"unicode_master_data_{checksum}.json"
     master_file_path = os.path.join(data_dir, master_filename)
 
-    if os.path.exists(master_file_path):
+    if os.path.isfile(master_file_path):
         return master_file_path
 
     return None
+
+
+def has_master_files(data_dir: str) -> bool:
+    """
+    Check whether any master file with a checksum has been saved.
+
+    Args:
+        data_dir: Directory to search for master data files
+
+    Returns:
+        True if the directory holds at least one master file, False otherwise
+    """
+    try:
+        with os.scandir(data_dir) as entries:
+            return any(
+                entry.name.startswith("unicode_master_data_")
+                and entry.name.endswith(".json")
+                for entry in entries
+            )
+    except OSError:
+        return False
+
+
+# Export options that do not affect the generated files
+RUN_KEY_IGNORED_OPTIONS = ("master_file_path", "debug")
+
+# Version of the exported file formats. Bump it whenever an exporter changes
+# its output, so that files written by an earlier version are not reused
+EXPORT_FORMAT_VERSION = 1
+
+
+def get_run_key(checksum: str, export_options) -> str:
+    """
+    Calculate a key identifying an export run.
+
+    Two runs with the same source files checksum, export options and export
+    format version produce the same output files, so they share a run key.
+
+    Args:
+        checksum: Combined checksum of the source files
+        export_options: Options for exporting Unicode data
+
+    Returns:
+        SHA-256 run key as a hexadecimal string
+    """
+    options = {
+        key: value
+        for key, value in dataclasses.asdict(export_options).items()
+        if key not in RUN_KEY_IGNORED_OPTIONS
+    }
+    run_key = hashlib.sha256(checksum.encode("utf-8"))
+    run_key.update(str(EXPORT_FORMAT_VERSION).encode("utf-8"))
+    run_key.update(repr(sorted(options.items())).encode("utf-8"))
+    return run_key.hexdigest()
+
+
+def get_run_manifest_path(data_dir: str, run_key: str) -> str:
+    """
+    Get the path to the manifest of an export run.
+
+    Args:
+        data_dir: Directory where the master data files are stored
+        run_key: Key identifying the export run
+
+    Returns:
+        Path to the run manifest file
+    """
+    return os.path.join(data_dir, ".runs", f"{run_key}.json")
+
+
+def save_run_manifest(
+    data_dir: str, run_key: str, output_files: list[str], formats: list[str]
+) -> bool:
+    """
+    Record the output files generated by an export run.
+
+    The manifest is only saved for complete runs, which generated one output
+    file per requested format.
+
+    Args:
+        data_dir: Directory where the master data files are stored
+        run_key: Key identifying the export run
+        output_files: Paths to the generated output files
+        formats: Formats requested for the export run
+
+    Returns:
+        True if the manifest was saved, False otherwise
+    """
+    manifest_path = get_run_manifest_path(data_dir, run_key)
+    if len(output_files) != len(formats):
+        logger.debug(
+            f"Not saving run manifest {manifest_path}: {len(output_files)} output "
+            f"files for {len(formats)} formats"
+        )
+        return False
+
+    try:
+        outputs = []
+        for output_file in output_files:
+            stat = os.stat(output_file)
+            outputs.append(
+                {
+                    "path": output_file,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                }
+            )
+
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"formats": formats, "outputs": outputs}, f, indent=2)
+
+        logger.debug(f"Saved run manifest: {manifest_path}")
+        return True
+    except Exception as e:
+        logger.debug(f"Failed to save run manifest {manifest_path}: {e}")
+        return False
+
+
+def find_run_outputs(
+    data_dir: str, run_key: str, formats: list[str]
+) -> Optional[list[str]]:
+    """
+    Find the output files of a previous identical export run.
+
+    The outputs are only returned if the run manifest lists one file per
+    requested format and every file still exists with the recorded size and
+    modification time.
+
+    Args:
+        data_dir: Directory where the master data files are stored
+        run_key: Key identifying the export run
+        formats: Formats requested for the export run
+
+    Returns:
+        Paths to the output files if they are still valid, None otherwise
+    """
+    manifest_path = get_run_manifest_path(data_dir, run_key)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        outputs = manifest["outputs"]
+        if manifest.get("formats") != formats or len(outputs) != len(formats):
+            logger.debug(f"Run manifest does not cover all formats: {manifest_path}")
+            return None
+
+        output_files = []
+        for output in outputs:
+            stat = os.stat(output["path"])
+            if stat.st_size != output["size"] or stat.st_mtime_ns != output["mtime_ns"]:
+                logger.debug(f"Output file changed since last run: {output['path']}")
+                return None
+            output_files.append(output["path"])
+
+        return output_files or None
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Failed to read run manifest {manifest_path}: {e}")
+        return None
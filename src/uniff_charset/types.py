@@ -2,7 +2,7 @@
 Type definitions and dataclasses for the uniff-charset package.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 from uniff_core.types import ExportOptions
@@ -23,3 +23,15 @@ class CharsetExportOptions(ExportOptions):
 
     unicode_blocks: Optional[list[str]] = None  # List of Unicode block names to include
     dataset: str = "every-day"  # Dataset to use ('every-day' or 'complete')
+
+
+@dataclass
+class FetchResult:
+    """Result of fetching the Unicode data files."""
+
+    paths: dict[str, str] = field(default_factory=dict)  # File type -> file path
+    from_cache: dict[str, bool] = field(default_factory=dict)  # File type -> cache hit
+
+    def __bool__(self) -> bool:
+        """A fetch is successful if all required files were retrieved."""
+        return bool(self.paths)
@@ -10,6 +10,8 @@ import subprocess
 import tempfile
 from typing import Optional
 
+from .config import COMPRESSION_EXTENSIONS
+
 
 def validate_csv_file(file_path: str) -> tuple[bool, Optional[str]]:
     """
@@ -233,8 +235,8 @@ def validate_exported_file(file_path: str) -> tuple[bool, Optional[str]]:
     if not os.path.exists(file_path):
         return False, f"File not found: {file_path}"
 
-    # Check if file is gzipped
-    if file_path.endswith(".gz"):
+    # Check if file is compressed
+    if file_path.endswith(tuple(COMPRESSION_EXTENSIONS.values())):
         return False, "Cannot validate compressed files. Please decompress first."
 
     # Determine file type based on extension
@@ -5,10 +5,14 @@ Base module for exporting processed data to various formats.
 import gzip
 import logging
 import os
+import shutil
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger("uniff")
 
+# Chunk size for copying files through the compressor
+COPY_BUFFER_SIZE = 1024 * 1024
+
 
 class Exporter(ABC):
     """Base class for data exporters."""
@@ -91,24 +95,30 @@ class ExporterRegistry:
         return list(self.exporters.keys())
 
 
-def compress_file(input_filename: str, output_filename: str) -> None:
+def compress_file(
+    input_filename: str, output_filename: str, compresslevel: int = 1
+) -> None:
     """
-    Compress a file using gzip with maximum compression level.
+    Compress a file using gzip.
+
+    Level 1 is several times faster than level 9 on text output and the files
+    are only slightly larger.
 
     Args:
         input_filename: Path to the input file
         output_filename: Path to the output compressed file (without extension)
+        compresslevel: Compression level (1-9)
     """
     try:
-        # Use the highest compression level (9) for maximum compression
         with (
             open(input_filename, "rb") as f_in,
-            gzip.open(output_filename + ".gz", "wb", compresslevel=9) as f_out,
+            gzip.open(
+                output_filename + ".gz", "wb", compresslevel=compresslevel
+            ) as f_out,
         ):
-            data = f_in.read()
-            f_out.write(data)
+            shutil.copyfileobj(f_in, f_out, COPY_BUFFER_SIZE)
             logger.debug(
-                f"Compressed file {input_filename} to {output_filename}.gz (original: {len(data)} bytes)"
+                f"Compressed file {input_filename} to {output_filename}.gz (original: {f_in.tell()} bytes)"
             )
     except Exception as e:
         logger.debug(f"Failed to compress file {input_filename}: {str(e)}")
@@ -127,10 +137,9 @@ def decompress_file(input_filename: str, output_filename: str) -> None:
             gzip.open(input_filename, "rb") as f_in,
             open(output_filename, "wb") as f_out,
         ):
-            data = f_in.read()
-            f_out.write(data)
+            shutil.copyfileobj(f_in, f_out, COPY_BUFFER_SIZE)
             logger.debug(
-                f"Decompressed file {input_filename} to {output_filename} (size: {len(data)} bytes)"
+                f"Decompressed file {input_filename} to {output_filename} (size: {f_out.tell()} bytes)"
             )
     except Exception as e:
         logger.debug(f"Failed to decompress file {input_filename}: {str(e)}")
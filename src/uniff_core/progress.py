@@ -4,6 +4,8 @@ Module for displaying hierarchical progress with checkmarks/X marks.
 
 import logging
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from enum import Enum
 from typing import Optional
 
@@ -32,6 +34,8 @@ class ProgressStatus(Enum):
 class ProgressItem:
     """A progress item in the hierarchical display."""
 
+    __slots__ = ("title", "parent", "children", "status", "details", "display")
+
     def __init__(self, title: str, parent: Optional["ProgressItem"] = None, display=None):
         """
         Initialize a progress item.
@@ -70,10 +74,13 @@ class ProgressItem:
         old_status = self.status
         self.status = status
         self.details = details
-        logger.debug(
-            f"Progress item '{self.title}' status changed: {old_status.name} -> {status.name}"
-            + (f" ({details})" if details else "")
-        )
+        # Status updates are frequent, so only build the message when it is logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Progress item '{self.title}' status changed: "
+                f"{old_status.name} -> {status.name}"
+                + (f" ({details})" if details else "")
+            )
 
         # Update the display if available
         if self.display:
@@ -137,6 +144,8 @@ class ProgressDisplay:
         self.root_items: list[ProgressItem] = []
         self.verbose = verbose
         self.last_output_lines = 0
+        self._batch_depth = 0
+        self._render_pending = False
 
     def add_root_item(self, title: str) -> ProgressItem:
         """
@@ -168,8 +177,55 @@ class ProgressDisplay:
         self.update_display()
         return item
 
+    def add_tree(
+        self, tree: dict[str, list[str]], **title_args
+    ) -> dict[str, ProgressItem]:
+        """
+        Add root items and their children in one pass, rendering only once.
+
+        Args:
+            tree: Dictionary mapping root item titles to lists of child item titles
+            **title_args: Values for "{name}" placeholders in the titles
+
+        Returns:
+            Dictionary mapping each title in the tree (before placeholder
+            substitution) to its progress item
+        """
+        items = {}
+        for root_title, child_titles in tree.items():
+            root = ProgressItem(root_title.format(**title_args), display=self)
+            self.root_items.append(root)
+            items[root_title] = root
+            for child_title in child_titles:
+                items[child_title] = ProgressItem(
+                    child_title.format(**title_args), root, display=self
+                )
+        self.update_display()
+        return items
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Defer rendering until the end of the block, then render once.
+
+        Use this around a group of status updates so the display is redrawn
+        once for the whole group rather than once per update.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._render_pending:
+                self._render_pending = False
+                self.update_display()
+
     def update_display(self) -> None:
         """Update the progress display."""
+        if self._batch_depth:
+            self._render_pending = True
+            return
+
         logger.debug("Updating progress display")
         # Clear the previous output
         if self.last_output_lines > 0:
@@ -18,13 +18,16 @@ class FetchOptions:
     use_temp_cache: bool = False  # If True, use temporary cache location
     data_dir: Optional[str] = None  # Directory to store the master data file
     force: bool = False  # If True, force regeneration of data files
+    stream: bool = True  # If True, parse files while the remaining ones download
+    revalidate: bool = False  # If True, check cached files for updates upstream
 
     def __post_init__(self):
         """Log fetch options after initialization."""
         logger.debug(
             f"FetchOptions created: cache={self.use_cache}, "
             f"cache_dir={self.cache_dir}, temp_cache={self.use_temp_cache}, "
-            f"data_dir={self.data_dir}"
+            f"data_dir={self.data_dir}, stream={self.stream}, "
+            f"revalidate={self.revalidate}"
         )
 
 
@@ -38,6 +41,10 @@ class ExportOptions:
     master_file_path: Optional[str] = None  # Path to the master data file
     dataset: str = "complete"  # Dataset to use ("everyday" or "complete")
     compress: bool = False  # Whether to compress the output files
+    compress_level: int = 1  # Compression level (1 = fastest, 9 = smallest)
+    compression: str = "gzip"  # Compression format ('gzip', 'zstd' or 'lz4')
+    json_indent: Optional[int] = None  # JSON indent (None = compact, one entry per line)
+    verify: bool = True  # Whether to validate uncompressed output files after writing
     debug: bool = False  # Whether to enable debug logging
 
     def __post_init__(self):
@@ -46,5 +53,7 @@ class ExportOptions:
             f"ExportOptions created: format={self.format_type}, "
             f"output_dir={self.output_dir}, use_master={self.use_master_file}, "
             f"master_path={self.master_file_path}, dataset={self.dataset}, "
-            f"compress={self.compress}, debug={self.debug}"
+            f"compress={self.compress}, compress_level={self.compress_level}, "
+            f"compression={self.compression}, json_indent={self.json_indent}, "
+            f"verify={self.verify}, debug={self.debug}"
         )
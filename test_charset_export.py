@@ -45,5 +45,5 @@ output_files = export_data(unicode_data, aliases_data, options)
 
 # Print the output files
 print(f"Generated {len(output_files)} files:")
-for file_path in output_files:
-    print(f"  - {file_path}")
+for file_path, file_size in output_files:
+    print(f"  - {file_path} ({file_size} bytes)")
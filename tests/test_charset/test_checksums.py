@@ -2,16 +2,24 @@
 Tests for the checksum functionality.
 """
 
+import hashlib
 import os
 import tempfile
 import unittest
+from unittest.mock import patch
 
 from uniff_charset.processor import (
     calculate_file_checksum,
     calculate_source_files_checksum,
     find_master_file_by_checksum,
+    find_run_outputs,
     get_master_file_path,
+    get_run_key,
+    load_master_meta,
+    save_master_data_file,
+    save_run_manifest,
 )
+from uniff_charset.types import CharsetExportOptions
 from uniff_core.types import FetchOptions
 
 
@@ -66,6 +74,19 @@ class TestChecksums(unittest.TestCase):
         # Verify that the checksum changed after modifying the file
         self.assertNotEqual(checksum1, modified_checksum)
 
+    def test_calculate_file_checksum_without_file_digest(self):
+        """Test that hashing in chunks gives the same MD5 as file_digest."""
+        with open(self.file1_path, "wb") as f:
+            f.write(os.urandom(3 * 1024 * 1024 + 1))
+
+        checksum = calculate_file_checksum(self.file1_path)
+        with patch("uniff_charset.processor.hashlib", spec=["md5"]) as mock_hashlib:
+            mock_hashlib.md5 = hashlib.md5
+            self.assertEqual(calculate_file_checksum(self.file1_path), checksum)
+
+        with open(self.file1_path, "rb") as f:
+            self.assertEqual(checksum, hashlib.md5(f.read()).hexdigest())
+
     def test_calculate_source_files_checksum(self):
         """Test calculating a combined checksum for multiple files."""
         # Calculate combined checksum
@@ -84,6 +105,18 @@ class TestChecksums(unittest.TestCase):
         # Verify that the combined checksum changed after modifying one of the files
         self.assertNotEqual(combined_checksum, modified_combined_checksum)
 
+    def test_calculate_source_files_checksum_memoized(self):
+        """Test that unchanged files are not hashed again."""
+        with patch(
+            "uniff_charset.processor.calculate_file_checksum",
+            wraps=calculate_file_checksum,
+        ) as mock_checksum:
+            first = calculate_source_files_checksum(self.file_paths)
+            second = calculate_source_files_checksum(dict(self.file_paths))
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_checksum.call_count, len(self.file_paths))
+
     def test_get_master_file_path_with_checksum(self):
         """Test getting a master file path with a checksum."""
         # Create fetch options
@@ -140,5 +173,106 @@ class TestChecksums(unittest.TestCase):
         self.assertIsNone(non_existent_path)
 
 
+class TestRunManifest(unittest.TestCase):
+    """Test the run manifest used to skip identical export runs."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.output_file = os.path.join(self.temp_dir.name, "unicode.complete.csv")
+        with open(self.output_file, "w", encoding="utf-8") as f:
+            f.write("code_point,character\n")
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+
+    def test_get_run_key(self):
+        """Test that the run key depends on the checksum, options and version."""
+        csv_options = CharsetExportOptions(format_type="csv")
+        json_options = CharsetExportOptions(format_type="json")
+
+        self.assertEqual(
+            get_run_key("abc", csv_options),
+            get_run_key("abc", CharsetExportOptions(format_type="csv")),
+        )
+        self.assertNotEqual(
+            get_run_key("abc", csv_options), get_run_key("def", csv_options)
+        )
+        self.assertNotEqual(
+            get_run_key("abc", csv_options), get_run_key("abc", json_options)
+        )
+
+        # A new export format version invalidates earlier runs
+        run_key = get_run_key("abc", csv_options)
+        with patch("uniff_charset.processor.EXPORT_FORMAT_VERSION", -1):
+            self.assertNotEqual(get_run_key("abc", csv_options), run_key)
+
+        # The master file path is set during the run and must not change the key
+        csv_options.master_file_path = "/tmp/unicode_master_data_abc.json"
+        self.assertEqual(
+            get_run_key("abc", csv_options),
+            get_run_key("abc", CharsetExportOptions(format_type="csv")),
+        )
+
+    def test_find_run_outputs(self):
+        """Test finding the outputs of a previous identical run."""
+        self.assertIsNone(find_run_outputs(self.temp_dir.name, "run_key", ["csv"]))
+
+        self.assertTrue(
+            save_run_manifest(self.temp_dir.name, "run_key", [self.output_file], ["csv"])
+        )
+        self.assertEqual(
+            find_run_outputs(self.temp_dir.name, "run_key", ["csv"]), [self.output_file]
+        )
+
+    def test_run_manifest_incomplete_run(self):
+        """Test that runs missing the output of a format are not reused."""
+        self.assertFalse(
+            save_run_manifest(
+                self.temp_dir.name, "run_key", [self.output_file], ["csv", "lua"]
+            )
+        )
+        self.assertIsNone(find_run_outputs(self.temp_dir.name, "run_key", ["csv", "lua"]))
+
+        save_run_manifest(self.temp_dir.name, "run_key", [self.output_file], ["csv"])
+        self.assertIsNone(find_run_outputs(self.temp_dir.name, "run_key", ["csv", "lua"]))
+
+    def test_find_run_outputs_modified_file(self):
+        """Test that modified or missing outputs invalidate the manifest."""
+        save_run_manifest(self.temp_dir.name, "run_key", [self.output_file], ["csv"])
+
+        with open(self.output_file, "a", encoding="utf-8") as f:
+            f.write("U+0041,A\n")
+        self.assertIsNone(find_run_outputs(self.temp_dir.name, "run_key", ["csv"]))
+
+        save_run_manifest(self.temp_dir.name, "run_key", [self.output_file], ["csv"])
+        os.remove(self.output_file)
+        self.assertIsNone(find_run_outputs(self.temp_dir.name, "run_key", ["csv"]))
+
+
+class TestMasterMeta(unittest.TestCase):
+    """Test the master file metadata sidecar."""
+
+    def test_save_master_data_file_writes_meta(self):
+        """Test that saving a master file also writes its metadata sidecar."""
+        unicode_data = {
+            "0041": {"name": "LATIN CAPITAL LETTER A", "category": "Lu", "char_obj": "A"}
+        }
+        aliases_data = {"0041": ["latin letter a"]}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            master_file_path = save_master_data_file(
+                unicode_data, aliases_data, temp_dir, checksum="abc"
+            )
+            meta = load_master_meta(master_file_path)
+
+            self.assertEqual(meta["char_count"], 1)
+            self.assertEqual(meta["aliases_count"], 1)
+            self.assertEqual(meta["checksum"], "abc")
+            self.assertIsNone(load_master_meta(os.path.join(temp_dir, "missing.json")))
+
+
 if __name__ == "__main__":
     unittest.main()
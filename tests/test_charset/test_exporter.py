@@ -2,9 +2,19 @@
 Tests for the exporter module.
 """
 
+import csv
+import gzip
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, mock_open, patch
 
+from uniff_charset import exporter as charset_exporter
+from uniff_charset.exporters.csv_exporter import get_max_aliases
+from uniff_charset.exporters.json_exporter import JSONExporter
+from uniff_charset.exporters.lua_exporter import LuaExporter, escape_lua_string
+from uniff_charset.types import CharsetExportOptions
 from uniff_gen.exporter import (
     export_data,
     save_source_files,
@@ -236,5 +246,282 @@ class TestExporter(unittest.TestCase):
         self.assertEqual(mock_copy.call_count, 3)
 
 
+class TestCharsetExporter(unittest.TestCase):
+    """Test the uniff_charset exporter module."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.unicode_data = {
+            "0041": {
+                "name": "LATIN CAPITAL LETTER A",
+                "category": "Lu",
+                "char_obj": "A",
+                "block": "Basic Latin",
+            },
+            "0042": {
+                "name": "LATIN CAPITAL LETTER B",
+                "category": "Lu",
+                "char_obj": "B",
+                "block": "Basic Latin",
+            },
+        }
+
+        self.aliases_data = {
+            "0041": ["latin letter a", "first letter"],
+            "0042": ["latin letter b"],
+        }
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+
+    def _export(self, **kwargs):
+        """Export the test data with the given options."""
+        options = CharsetExportOptions(
+            output_dir=self.temp_dir.name, dataset="complete", **kwargs
+        )
+        return charset_exporter.export_data(self.unicode_data, self.aliases_data, options)
+
+    def test_export_data_reports_file_sizes(self):
+        """Test that export_data returns the size of each generated file."""
+        results = self._export(format_type="all")
+
+        self.assertEqual(len(results), 4)
+        for output_file, file_size in results:
+            self.assertTrue(os.path.exists(output_file))
+            self.assertEqual(file_size, os.path.getsize(output_file))
+
+    def test_export_data_reports_compressed_file_sizes(self):
+        """Test that compressed outputs report the size of the .gz file."""
+        results = self._export(format_type="all", compress=True)
+
+        self.assertEqual(len(results), 4)
+        for output_file, file_size in results:
+            self.assertTrue(output_file.endswith(".gz"))
+            self.assertEqual(file_size, os.path.getsize(output_file))
+
+    def test_export_data_verify_can_be_skipped(self):
+        """Test that output files are only validated when verify is set."""
+        with patch(
+            "uniff_charset.exporters.json_exporter.JSONExporter.verify",
+            return_value=(True, None),
+        ) as mock_verify:
+            ((output_file, _),) = self._export(format_type="json")
+            mock_verify.assert_called_once_with(output_file)
+
+            mock_verify.reset_mock()
+            self._export(format_type="json", verify=False)
+            mock_verify.assert_not_called()
+
+    @unittest.skipUnless(
+        charset_exporter.PARALLEL_EXPORT_AVAILABLE, "fork is not available"
+    )
+    def test_parallel_export_matches_optimized_export(self):
+        """Test that exporting formats in worker processes gives identical files."""
+        options = CharsetExportOptions(output_dir=self.temp_dir.name, dataset="complete")
+        formats = ["csv", "json", "lua", "txt"]
+
+        serial_outputs = {}
+        for output_file, _ in charset_exporter.optimized_export(
+            self.unicode_data, self.aliases_data, formats, options
+        ):
+            with open(output_file, "rb") as f:
+                serial_outputs[output_file] = f.read()
+
+        results = charset_exporter.parallel_export(
+            self.unicode_data, self.aliases_data, formats, options
+        )
+
+        self.assertEqual([path for path, _ in results], list(serial_outputs))
+        for output_file, file_size in results:
+            with open(output_file, "rb") as f:
+                self.assertEqual(f.read(), serial_outputs[output_file])
+            self.assertEqual(file_size, len(serial_outputs[output_file]))
+
+    @unittest.skipUnless(
+        charset_exporter.PARALLEL_EXPORT_AVAILABLE, "fork is not available"
+    )
+    def test_parallel_export_failing_format(self):
+        """Test that a format failing in a worker fails the whole export."""
+
+        def fail(file_handler, record, aliases, state):
+            raise ValueError("cannot write record")
+
+        options = CharsetExportOptions(output_dir=self.temp_dir.name, dataset="complete")
+        formats = ["csv", "json", "lua", "txt"]
+        with patch.dict(charset_exporter.RECORD_WRITERS, {"lua": fail}):
+            with self.assertRaises(RuntimeError):
+                charset_exporter.parallel_export(
+                    self.unicode_data, self.aliases_data, formats, options
+                )
+
+            with patch("uniff_charset.exporter.os.cpu_count", return_value=4):
+                self.assertEqual(self._export(format_type="all"), [])
+            self.assertEqual(
+                charset_exporter.optimized_export(
+                    self.unicode_data, self.aliases_data, formats, options
+                ),
+                [],
+            )
+
+        self.assertFalse(
+            os.path.exists(os.path.join(self.temp_dir.name, "unicode.complete.lua"))
+        )
+
+    def _assert_compressed_round_trip(self, compression, extension, decompress):
+        """Check compressed outputs decompress to the uncompressed export."""
+        uncompressed = {}
+        for output_file, _ in self._export(format_type="all"):
+            with open(output_file, "rb") as f:
+                uncompressed[output_file + extension] = f.read()
+
+        results = self._export(format_type="all", compress=True, compression=compression)
+
+        self.assertEqual(sorted(path for path, _ in results), sorted(uncompressed))
+        for output_file, file_size in results:
+            self.assertEqual(file_size, os.path.getsize(output_file))
+            with open(output_file, "rb") as f:
+                self.assertEqual(decompress(f.read()), uncompressed[output_file])
+
+    def test_open_compressed_threaded(self):
+        """Test that compressing in a background thread keeps all the data."""
+        data = "".join(f"line {i}\n" for i in range(100000)).encode()
+        path = os.path.join(self.temp_dir.name, "threaded")
+
+        with charset_exporter.open_compressed(
+            path, buffer_size=64 * 1024, threaded=True
+        ) as f:
+            for start in range(0, len(data), 1000):
+                f.write(data[start : start + 1000])
+
+        with gzip.open(path + ".gz", "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    @unittest.skipUnless(charset_exporter.ZSTD_AVAILABLE, "zstandard is not installed")
+    def test_export_data_zstd(self):
+        """Test exporting with zstd compression."""
+        import zstandard
+
+        def decompress(data):
+            # Streamed frames carry no content size, so use a decompression object
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+        self._assert_compressed_round_trip("zstd", ".zst", decompress)
+
+    @unittest.skipUnless(charset_exporter.LZ4_AVAILABLE, "lz4 is not installed")
+    def test_export_data_lz4(self):
+        """Test exporting with LZ4 compression."""
+        import lz4.frame
+
+        self._assert_compressed_round_trip("lz4", ".lz4", lz4.frame.decompress)
+
+    def test_export_csv_quotes_special_fields(self):
+        """Test that CSV fields with delimiters, quotes or newlines are quoted."""
+        self.unicode_data["002C"] = {
+            "name": "COMMA",
+            "category": "Po",
+            "char_obj": ",",
+            "block": "Basic Latin",
+        }
+        self.aliases_data["0042"] = ['say "b"', "line\nbreak"]
+
+        ((output_file, _),) = self._export(format_type="csv")
+        with open(output_file, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+
+        self.assertEqual(
+            rows[1:],
+            [
+                ["U+0041", "A", "LATIN CAPITAL LETTER A", "Lu", "Basic Latin"]
+                + ["latin letter a", "first letter"],
+                ["U+0042", "B", "LATIN CAPITAL LETTER B", "Lu", "Basic Latin"]
+                + ['say "b"', "line\nbreak"],
+                ["U+002C", ",", "COMMA", "Po", "Basic Latin", "", ""],
+            ],
+        )
+
+    def test_get_max_aliases_ignores_unexported_characters(self):
+        """Test that only aliases of exported characters set the CSV width."""
+        self.assertEqual(get_max_aliases(self.unicode_data, self.aliases_data), 2)
+
+        self.aliases_data["0043"] = ["c1", "c2", "c3"]
+        self.assertEqual(get_max_aliases(self.unicode_data, self.aliases_data), 2)
+        self.assertEqual(get_max_aliases(self.unicode_data, {}), 0)
+
+    def test_export_json_compact_and_pretty(self):
+        """Test that JSON entries are compact by default and indented when asked."""
+        ((output_file, _),) = self._export(format_type="json")
+        with open(output_file, encoding="utf-8") as f:
+            compact_output = f.read()
+
+        self._export(format_type="json", json_indent=2)
+        with open(output_file, encoding="utf-8") as f:
+            pretty_output = f.read()
+
+        self.assertEqual(len(compact_output.splitlines()), len(self.unicode_data) + 2)
+        self.assertIn('{"code_point":"U+0041",', compact_output)
+        self.assertIn('\n  "code_point": "U+0041",', pretty_output)
+        self.assertEqual(json.loads(compact_output), json.loads(pretty_output))
+
+    @unittest.skipUnless(charset_exporter.ORJSON_AVAILABLE, "orjson is not installed")
+    def test_export_json_matches_without_orjson(self):
+        """Test that the orjson and json module writers produce identical files."""
+        self.unicode_data["000A"] = {
+            "name": "LINE FEED",
+            "category": "Cc",
+            "char_obj": "\n",
+            "block": "Basic Latin",
+        }
+        for json_indent in (None, 2):
+            ((output_file, _),) = self._export(
+                format_type="json", json_indent=json_indent
+            )
+            with open(output_file, "rb") as f:
+                orjson_output = f.read()
+
+            with patch("uniff_charset.exporter.ORJSON_AVAILABLE", False):
+                self._export(format_type="json", json_indent=json_indent)
+            with open(output_file, "rb") as f:
+                json_output = f.read()
+
+            self.assertEqual(orjson_output, json_output)
+
+    def test_json_exporter_matches_export_data(self):
+        """Test that JSONExporter.write produces the same file as export_data."""
+        ((output_file, _),) = self._export(format_type="json")
+        with open(output_file, "rb") as f:
+            expected = f.read()
+
+        for orjson_available in (charset_exporter.ORJSON_AVAILABLE, False):
+            with patch(
+                "uniff_charset.exporters.json_exporter.ORJSON_AVAILABLE",
+                orjson_available,
+            ):
+                JSONExporter().write(self.unicode_data, self.aliases_data, output_file)
+            with open(output_file, "rb") as f:
+                self.assertEqual(f.read(), expected)
+
+    def test_lua_exporter_matches_export_data(self):
+        """Test that LuaExporter.write produces the same file as export_data."""
+        self.aliases_data["0042"] = ['say "b"']
+        ((output_file, _),) = self._export(format_type="lua")
+        with open(output_file, "rb") as f:
+            expected = f.read()
+
+        LuaExporter().write(self.unicode_data, self.aliases_data, output_file)
+        with open(output_file, "rb") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_escape_lua_string(self):
+        """Test escaping quotes, backslashes and control characters for Lua."""
+        self.assertEqual(escape_lua_string("plain"), "plain")
+        self.assertEqual(escape_lua_string('say "hi"'), 'say \\"hi\\"')
+        self.assertEqual(escape_lua_string("a\\b"), "a\\\\b")
+        self.assertEqual(escape_lua_string("\n\r\t"), "\\n\\r\\t")
+        self.assertEqual(escape_lua_string("\x00\x1f"), "\\000\\031")
+
+
 if __name__ == "__main__":
     unittest.main()
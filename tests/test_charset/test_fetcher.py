@@ -2,11 +2,18 @@
 Tests for the fetcher module.
 """
 
+import json
 import os
 import tempfile
+import threading
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import requests
+
+from uniff_charset import config as charset_config
+from uniff_charset import fetcher as charset_fetcher
+from uniff_core import types as core_types
 from uniff_gen.config import (
     CLDR_ANNOTATIONS_URL,
     NAME_ALIASES_FILE_URL,
@@ -160,5 +167,215 @@ class TestFetcher(unittest.TestCase):
         self.assertNotIn("cldr_annotations", result)
 
 
+class TestCharsetFetcher(unittest.TestCase):
+    """Test the uniff_charset fetcher module."""
+
+    def setUp(self):
+        """Set up a temporary cache directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.options = core_types.FetchOptions(
+            use_cache=True, cache_dir=self.temp_dir.name
+        )
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+
+    @patch("uniff_charset.fetcher._SESSION.get")
+    def test_download_file_on_download(self, mock_get):
+        """Test that on_download only fires for fresh downloads."""
+        mock_response = mock_get.return_value
+        mock_response.iter_content.return_value = [b"test data"]
+        mock_response.raise_for_status.return_value = None
+
+        on_download = MagicMock()
+        result = charset_fetcher.download_file(
+            charset_config.UNICODE_DATA_FILE_URL, self.options, on_download
+        )
+        on_download.assert_called_once_with(result)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["UnicodeData.txt"])
+
+        # The second call is served from the cache
+        on_download.reset_mock()
+        charset_fetcher.download_file(
+            charset_config.UNICODE_DATA_FILE_URL, self.options, on_download
+        )
+        on_download.assert_not_called()
+
+    @patch("uniff_charset.fetcher._SESSION.get")
+    def test_download_file_failure_leaves_cache_empty(self, mock_get):
+        """Test that a failed download leaves no partial file in the cache."""
+        mock_response = mock_get.return_value
+        mock_response.iter_content.side_effect = requests.ConnectionError("reset")
+
+        self.assertIsNone(
+            charset_fetcher.download_file(
+                charset_config.UNICODE_DATA_FILE_URL, self.options
+            )
+        )
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    @patch("uniff_charset.fetcher._SESSION.get")
+    def test_download_file_without_cache_always_downloads(self, mock_get):
+        """Test that files are downloaded afresh on every call without a cache."""
+        mock_response = mock_get.return_value
+        mock_response.status_code = 200
+        mock_response.headers = {"ETag": '"v1"'}
+        mock_response.iter_content.return_value = [b"test data"]
+
+        options = core_types.FetchOptions(use_cache=False, revalidate=True)
+        on_download = MagicMock()
+        with patch("tempfile.gettempdir", return_value=self.temp_dir.name):
+            for _ in range(2):
+                path = charset_fetcher.download_file(
+                    charset_config.UNICODE_DATA_FILE_URL, options, on_download
+                )
+                mock_get.assert_called_with(
+                    charset_config.UNICODE_DATA_FILE_URL, stream=True, headers={}
+                )
+
+        self.assertEqual(on_download.call_count, 2)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["uniff-gen-UnicodeData.txt"])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"test data")
+
+    @patch("uniff_charset.fetcher._SESSION.get")
+    def test_download_file_revalidates_cache(self, mock_get):
+        """Test that cached files are revalidated with their saved ETag."""
+        mock_response = mock_get.return_value
+        mock_response.status_code = 200
+        mock_response.headers = {"ETag": '"v1"'}
+        mock_response.iter_content.return_value = [b"test data"]
+
+        path = charset_fetcher.download_file(
+            charset_config.UNICODE_DATA_FILE_URL, self.options
+        )
+        self.assertEqual(
+            sorted(os.listdir(self.temp_dir.name)),
+            ["UnicodeData.txt", "UnicodeData.txt.etag"],
+        )
+
+        # Without revalidation, the cached file is used without a request
+        mock_get.reset_mock()
+        self.assertEqual(
+            charset_fetcher.download_file(
+                charset_config.UNICODE_DATA_FILE_URL, self.options
+            ),
+            path,
+        )
+        mock_get.assert_not_called()
+
+        # The server reports the file as unchanged
+        options = core_types.FetchOptions(
+            use_cache=True, cache_dir=self.temp_dir.name, revalidate=True
+        )
+        on_download = MagicMock()
+        mock_response.status_code = 304
+        mock_response.iter_content.return_value = []
+        self.assertEqual(
+            charset_fetcher.download_file(
+                charset_config.UNICODE_DATA_FILE_URL, options, on_download
+            ),
+            path,
+        )
+        mock_get.assert_called_once_with(
+            charset_config.UNICODE_DATA_FILE_URL,
+            stream=True,
+            headers={"If-None-Match": '"v1"'},
+        )
+        on_download.assert_not_called()
+
+        # The cached file is still used if the server cannot be reached
+        mock_get.side_effect = requests.ConnectionError("offline")
+        self.assertEqual(
+            charset_fetcher.download_file(
+                charset_config.UNICODE_DATA_FILE_URL, options, on_download
+            ),
+            path,
+        )
+        on_download.assert_not_called()
+
+        # A changed file replaces the cached copy
+        mock_get.side_effect = None
+        mock_response.status_code = 200
+        mock_response.headers = {"ETag": '"v2"'}
+        mock_response.iter_content.return_value = [b"new data"]
+        charset_fetcher.download_file(
+            charset_config.UNICODE_DATA_FILE_URL, options, on_download
+        )
+        on_download.assert_called_once_with(path)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"new data")
+        with open(path + ".etag", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"If-None-Match": '"v2"'})
+
+    @patch("uniff_charset.fetcher._SESSION.get")
+    def test_fetch_all_data_files_on_download(self, mock_get):
+        """Test that fetch_all_data_files reports each downloaded file."""
+        mock_response = mock_get.return_value
+        mock_response.iter_content.return_value = [b"test data"]
+        mock_response.raise_for_status.return_value = None
+
+        downloaded = {}
+        result = charset_fetcher.fetch_all_data_files(
+            self.options, lambda file_type, path: downloaded.update({file_type: path})
+        )
+
+        self.assertEqual(downloaded, result.paths)
+        self.assertEqual(
+            set(result.paths),
+            {"unicode_data", "name_aliases", "names_list", "cldr_annotations"},
+        )
+        self.assertFalse(any(result.from_cache.values()))
+
+    @patch("uniff_charset.fetcher._SESSION.get")
+    def test_fetch_all_data_files_from_cache(self, mock_get):
+        """Test that fetch_all_data_files reports which files came from the cache."""
+        mock_response = mock_get.return_value
+        mock_response.iter_content.return_value = [b"test data"]
+        mock_response.raise_for_status.return_value = None
+
+        charset_fetcher.fetch_all_data_files(self.options)
+        result = charset_fetcher.fetch_all_data_files(self.options)
+
+        self.assertTrue(result)
+        self.assertTrue(all(result.from_cache.values()))
+        self.assertEqual(set(result.from_cache), set(result.paths))
+
+    @patch("uniff_charset.fetcher.download_file")
+    def test_fetch_all_data_files_downloads_concurrently(self, mock_download):
+        """Test that all data files are downloaded at the same time."""
+        # Every download waits until all four are in progress
+        barrier = threading.Barrier(4, timeout=5)
+
+        def download(url, options, on_download=None):
+            barrier.wait()
+            return os.path.basename(url)
+
+        mock_download.side_effect = download
+        result = charset_fetcher.fetch_all_data_files(self.options)
+
+        self.assertEqual(
+            list(result.paths),
+            ["unicode_data", "name_aliases", "names_list", "cldr_annotations"],
+        )
+
+    @patch("uniff_charset.fetcher.download_file")
+    def test_fetch_all_data_files_missing_files(self, mock_download):
+        """Test that only the CLDR annotations may fail to download."""
+        mock_download.side_effect = lambda url, options, on_download=None: (
+            None if url == charset_config.CLDR_ANNOTATIONS_URL else os.path.basename(url)
+        )
+        result = charset_fetcher.fetch_all_data_files(self.options)
+        self.assertEqual(
+            set(result.paths), {"unicode_data", "name_aliases", "names_list"}
+        )
+
+        mock_download.side_effect = lambda url, options, on_download=None: (
+            None if url == charset_config.NAME_ALIASES_FILE_URL else os.path.basename(url)
+        )
+        self.assertFalse(charset_fetcher.fetch_all_data_files(self.options))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,10 +2,18 @@
 Tests for the main CLI interface.
 """
 
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
 from click.testing import CliRunner
+
+from uniff_charset import core as charset_core
+from uniff_charset.types import CharsetExportOptions, FetchResult
+from uniff_core import types as core_types
 from uniff_gen.cli import cli, generate, info
 from uniff_gen.core import process_unicode_data
 from uniff_gen.types import ExportOptions, FetchOptions
@@ -184,5 +192,225 @@ class TestMain(unittest.TestCase):
         self.assertIn("info", result.output)
 
 
+class TestCharsetCore(unittest.TestCase):
+    """Test the uniff_charset core module."""
+
+    @patch.dict(os.environ, {charset_core.TEST_MODE_ENV_VAR: "1"})
+    @patch("uniff_charset.core.fetch_all_data_files")
+    @patch("uniff_charset.core.process_data_files")
+    @patch("uniff_charset.core.export_data")
+    @patch("uniff_charset.core.save_source_files")
+    @patch("uniff_charset.core.ProgressDisplay")
+    def test_process_unicode_data_test_mode(
+        self, mock_progress, mock_save, mock_export, mock_process, mock_fetch
+    ):
+        """Test that the test mode environment variable skips the progress display."""
+        mock_fetch.return_value = FetchResult(
+            paths={"unicode_data": "/tmp/UnicodeData.txt"},
+            from_cache={"unicode_data": False},
+        )
+        mock_process.return_value = ({"0041": MagicMock()}, {"0041": ["A"]})
+        mock_export.return_value = [("/tmp/unicode_data.csv", 10)]
+
+        fetch_options = core_types.FetchOptions(use_cache=False)
+        export_options = CharsetExportOptions(format_type="csv", output_dir="/tmp")
+        success, output_files = charset_core.process_unicode_data(
+            fetch_options, export_options
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(output_files, ["/tmp/unicode_data.csv"])
+        mock_progress.assert_not_called()
+        mock_save.assert_called_once_with(
+            {"unicode_data": "/tmp/UnicodeData.txt"}, "/tmp"
+        )
+
+    @patch("uniff_charset.core.fetch_all_data_files")
+    @patch("uniff_charset.core.calculate_source_files_checksum", return_value="abc")
+    @patch("uniff_charset.core.find_run_outputs")
+    @patch("uniff_charset.core.process_data_files")
+    @patch("uniff_charset.core.save_source_files")
+    @patch("uniff_charset.core.ProgressDisplay")
+    def test_process_unicode_data_unchanged_run(
+        self, mock_progress, mock_save, mock_process, mock_find, mock_checksum, mock_fetch
+    ):
+        """Test that skipping an unchanged run still saves the source files."""
+        file_paths = {"unicode_data": "/tmp/UnicodeData.txt"}
+        mock_fetch.return_value = FetchResult(
+            paths=file_paths, from_cache={"unicode_data": True}
+        )
+        mock_find.return_value = ["/tmp/unicode.complete.csv"]
+
+        export_options = CharsetExportOptions(format_type="csv", output_dir="/tmp")
+        success, output_files = charset_core.process_unicode_data(
+            core_types.FetchOptions(use_cache=False), export_options, in_test=False
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(output_files, ["/tmp/unicode.complete.csv"])
+        self.assertEqual(mock_find.call_args.args[2], ["csv"])
+        mock_process.assert_not_called()
+        mock_save.assert_called_once_with(file_paths, "/tmp")
+
+    @patch("uniff_charset.core.fetch_all_data_files")
+    @patch("uniff_charset.core.parse_unicode_data")
+    @patch("uniff_charset.core.find_run_outputs", return_value=None)
+    @patch("uniff_charset.core.find_master_file_by_checksum")
+    @patch("uniff_charset.core.load_master_meta", return_value={"char_count": 1})
+    @patch("uniff_charset.core.export_data")
+    @patch("uniff_charset.core.save_run_manifest")
+    @patch("uniff_charset.core.save_source_files")
+    @patch("uniff_charset.core.ProgressDisplay")
+    def test_process_unicode_data_joins_parse_before_export(
+        self,
+        mock_progress,
+        mock_save,
+        mock_manifest,
+        mock_export,
+        mock_meta,
+        mock_find_master,
+        mock_find,
+        mock_parse,
+        mock_fetch,
+    ):
+        """Test that the background parse has stopped before exporting."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_paths = {}
+            for file_type in ("unicode_data", "name_aliases", "names_list"):
+                file_paths[file_type] = os.path.join(temp_dir, file_type)
+                with open(file_paths[file_type], "w", encoding="utf-8") as f:
+                    f.write(file_type)
+
+            def fetch(options, on_download=None):
+                on_download("unicode_data", file_paths["unicode_data"])
+                return FetchResult(
+                    paths=file_paths, from_cache=dict.fromkeys(file_paths, False)
+                )
+
+            def export(unicode_data, aliases_data, options):
+                # Export workers may be forked, so no parse thread may be alive
+                self.assertFalse(mock_parse.running.is_set())
+                return [(os.path.join(temp_dir, "unicode.complete.csv"), 10)]
+
+            mock_parse.running = threading.Event()
+
+            def parse(path):
+                mock_parse.running.set()
+                time.sleep(0.2)
+                mock_parse.running.clear()
+                return {}
+
+            mock_fetch.side_effect = fetch
+            mock_parse.side_effect = parse
+            mock_find_master.return_value = os.path.join(temp_dir, "master.json")
+            mock_export.side_effect = export
+
+            success, _ = charset_core.process_unicode_data(
+                core_types.FetchOptions(data_dir=temp_dir),
+                CharsetExportOptions(format_type="csv", output_dir=temp_dir),
+                in_test=False,
+            )
+
+        self.assertTrue(success)
+        mock_export.assert_called_once()
+
+    @patch("uniff_charset.core.fetch_all_data_files")
+    @patch("uniff_charset.core.parse_unicode_data")
+    @patch("uniff_charset.core.find_run_outputs", return_value=None)
+    @patch("uniff_charset.core.load_master_meta", return_value={"char_count": 1})
+    @patch("uniff_charset.core.export_data")
+    @patch("uniff_charset.core.save_run_manifest")
+    @patch("uniff_charset.core.save_source_files")
+    @patch("uniff_charset.core.ProgressDisplay")
+    def test_process_unicode_data_no_background_parse_with_master_files(
+        self,
+        mock_progress,
+        mock_save,
+        mock_manifest,
+        mock_export,
+        mock_meta,
+        mock_find,
+        mock_parse,
+        mock_fetch,
+    ):
+        """Test that nothing is parsed in the background when a master file may hit."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_paths = {}
+            for file_type in ("unicode_data", "name_aliases", "names_list"):
+                file_paths[file_type] = os.path.join(temp_dir, file_type)
+                with open(file_paths[file_type], "w", encoding="utf-8") as f:
+                    f.write(file_type)
+
+            checksum = charset_core.calculate_source_files_checksum(file_paths)
+            master_file = os.path.join(temp_dir, f"unicode_master_data_{checksum}.json")
+            with open(master_file, "w", encoding="utf-8") as f:
+                f.write("{}")
+
+            def fetch(options, on_download=None):
+                if on_download:
+                    on_download("unicode_data", file_paths["unicode_data"])
+                return FetchResult(
+                    paths=file_paths, from_cache=dict.fromkeys(file_paths, False)
+                )
+
+            mock_fetch.side_effect = fetch
+            mock_export.return_value = [(os.path.join(temp_dir, "unicode.csv"), 10)]
+
+            success, _ = charset_core.process_unicode_data(
+                core_types.FetchOptions(data_dir=temp_dir),
+                CharsetExportOptions(format_type="csv", output_dir=temp_dir),
+                in_test=False,
+            )
+
+        self.assertTrue(success)
+        mock_parse.assert_not_called()
+        self.assertEqual(mock_export.call_args.args[2].master_file_path, master_file)
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the in-process result memo."""
+
+    def setUp(self):
+        """Set up an output and a source file."""
+        charset_core.clear_result_cache()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.temp_dir.name, "unicode.complete.csv")
+        self.source_file = os.path.join(self.temp_dir.name, "UnicodeData.txt")
+        for path in (self.output_file, self.source_file):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("data\n")
+        self.key = charset_core.get_result_cache_key(
+            core_types.FetchOptions(use_cache=True),
+            CharsetExportOptions(format_type="csv"),
+        )
+
+    def tearDown(self):
+        """Clean up after tests."""
+        charset_core.clear_result_cache()
+        self.temp_dir.cleanup()
+
+    def test_memoized_result(self):
+        """Test that a memoized result is returned while its files are unchanged."""
+        self.assertIsNone(charset_core.get_memoized_result(self.key))
+
+        charset_core.memoize_result(self.key, [self.output_file], [self.source_file])
+        self.assertEqual(charset_core.get_memoized_result(self.key), [self.output_file])
+
+        with open(self.source_file, "a", encoding="utf-8") as f:
+            f.write("changed\n")
+        self.assertIsNone(charset_core.get_memoized_result(self.key))
+
+    def test_memoized_result_eviction(self):
+        """Test that the least frequently used result is evicted when full."""
+        charset_core.memoize_result(self.key, [self.output_file], [self.source_file])
+        charset_core.get_memoized_result(self.key)
+
+        for i in range(charset_core.RESULT_CACHE_SIZE):
+            charset_core.memoize_result(f"key{i}", [self.output_file], [self.source_file])
+
+        self.assertEqual(charset_core.get_memoized_result(self.key), [self.output_file])
+        self.assertIsNone(charset_core.get_memoized_result("key0"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -9,6 +9,8 @@ import unittest
 from collections import defaultdict
 from unittest.mock import MagicMock, patch
 
+from uniff_charset import config as charset_config
+from uniff_charset import processor as charset_processor
 from uniff_gen.processor import (
     parse_cldr_annotations,
     parse_name_aliases,
@@ -529,5 +531,242 @@ class TestProcessor(unittest.TestCase):
         self.assertEqual(odd_stats["median_aliases_per_char"], 2.0)
 
 
+class TestCharsetProcessor(unittest.TestCase):
+    """Test the uniff_charset processor module."""
+
+    def _lookup(self, tables, code_point):
+        """Look up a code point in tables built by build_block_tables."""
+        page_offsets, pages, block_names = tables
+        return block_names[pages[page_offsets[code_point >> 8] + (code_point & 0xFF)]]
+
+    def test_build_block_tables(self):
+        """Test that the block tables match a linear scan of the ranges."""
+        unicode_blocks = {
+            range(0x0000, 0x0080): "Basic Latin",
+            range(0x0070, 0x0110): "Overlapping",
+            range(0x10FF00, 0x110000): "Last Page",
+        }
+        tables = charset_processor.build_block_tables(unicode_blocks)
+
+        for code_point in (0x0000, 0x007F, 0x0080, 0x00FF, 0x0100, 0x010F):
+            expected = next(
+                (name for r, name in unicode_blocks.items() if code_point in r),
+                "Unknown Block",
+            )
+            self.assertEqual(self._lookup(tables, code_point), expected)
+        self.assertEqual(self._lookup(tables, 0x0110), "Unknown Block")
+        self.assertEqual(self._lookup(tables, 0x10FFFF), "Last Page")
+
+        # Pages outside any block share one page in the second table
+        self.assertEqual(len(tables[1]), 4 * 256)
+
+    def test_get_unicode_block(self):
+        """Test looking up the block of code points from config.yaml."""
+        unicode_blocks = charset_config.get_unicode_blocks()
+        for block_range, block_name in unicode_blocks.items():
+            self.assertEqual(
+                charset_processor.get_unicode_block(block_range.start), block_name
+            )
+            self.assertEqual(
+                charset_processor.get_unicode_block(block_range.stop - 1), block_name
+            )
+
+        self.assertEqual(charset_processor.get_unicode_block(-1), "Unknown Block")
+        self.assertEqual(charset_processor.get_unicode_block(0x110000), "Unknown Block")
+
+    def test_parse_unicode_data_blocks(self):
+        """Test that parsed characters are assigned their block."""
+        with tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8") as f:
+            f.write("0041;LATIN CAPITAL LETTER A;Lu;0;L;;;;;N;;;;0061;\n")
+            f.write("10FFFD;<Plane 16 Private Use, Last>;Co;0;L;;;;;N;;;;;\n")
+            f.write("E01EF;VARIATION SELECTOR-256;Mn;0;NSM;;;;;N;;;;;\n")
+        try:
+            data = charset_processor.parse_unicode_data(f.name)
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual(list(data), ["0041", "E01EF"])
+        self.assertEqual(data["0041"]["block"], "Basic Latin")
+        self.assertEqual(
+            data["E01EF"]["block"], charset_processor.get_unicode_block(0xE01EF)
+        )
+
+    def test_parse_cldr_annotations(self):
+        """Test streaming annotations from a CLDR annotations file."""
+        with tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8") as f:
+            f.write(
+                '<?xml version="1.0" encoding="UTF-8" ?>\n'
+                "<ldml><annotations>\n"
+                '<annotation cp="A">letter a | first letter</annotation>\n'
+                '<annotation cp="A" type="tts">capital a</annotation>\n'
+                '<annotation cp="\U0001f44d\U0001f3fb">thumbs up</annotation>\n'
+                '<annotation cp="B"/>\n'
+                "</annotations></ldml>\n"
+            )
+        try:
+            result = charset_processor.parse_cldr_annotations(f.name)
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual(
+            result, {"41": ["letter a", "first letter"], "1F44D": ["thumbs up"]}
+        )
+
+    def test_calculate_alias_statistics(self):
+        """Test the alias statistics for odd and even numbers of characters."""
+        aliases_data = {"0041": ["a", "b", "c"], "0042": [], "0043": ["c"]}
+        self.assertEqual(
+            charset_processor.calculate_alias_statistics(aliases_data),
+            {
+                "total_characters": 3,
+                "total_aliases": 4,
+                "avg_aliases_per_char": 4 / 3,
+                "median_aliases_per_char": 1,
+                "max_aliases": 3,
+                "min_aliases": 0,
+                "chars_with_no_aliases": 1,
+            },
+        )
+
+        aliases_data["0044"] = ["d", "e"]
+        stats = charset_processor.calculate_alias_statistics(aliases_data)
+        self.assertEqual(stats["median_aliases_per_char"], 1.5)
+        self.assertEqual(list(map(len, aliases_data.values())), [3, 0, 1, 2])
+
+    def test_filter_by_unicode_blocks(self):
+        """Test keeping only the characters and aliases of the given blocks."""
+        unicode_data = {
+            "0041": {"name": "LATIN CAPITAL LETTER A", "block": "Basic Latin"},
+            "00E9": {"name": "LATIN SMALL LETTER E WITH ACUTE"},
+            "0391": {"name": "GREEK CAPITAL LETTER ALPHA", "block": "Greek and Coptic"},
+        }
+        aliases_data = {"0041": ["letter a"], "00E9": ["e acute"]}
+
+        self.assertEqual(
+            charset_processor.filter_by_unicode_blocks(
+                unicode_data, aliases_data, ["Basic Latin"]
+            ),
+            ({"0041": unicode_data["0041"]}, {"0041": ["letter a"]}),
+        )
+        self.assertEqual(
+            charset_processor.filter_by_unicode_blocks(
+                unicode_data, aliases_data, ["Greek and Coptic"]
+            ),
+            ({"0391": unicode_data["0391"]}, {}),
+        )
+        for blocks in (None, [], ["all"]):
+            self.assertEqual(
+                charset_processor.filter_by_unicode_blocks(
+                    unicode_data, aliases_data, blocks
+                ),
+                (unicode_data, aliases_data),
+            )
+
+    def test_has_master_files(self):
+        """Test detecting saved master files in the data directory."""
+        with tempfile.TemporaryDirectory() as data_dir:
+            self.assertFalse(charset_processor.has_master_files(data_dir))
+
+            with open(os.path.join(data_dir, "unicode_master_data.json"), "w") as f:
+                f.write("{}")
+            self.assertFalse(charset_processor.has_master_files(data_dir))
+
+            with open(os.path.join(data_dir, "unicode_master_data_abc.json"), "w") as f:
+                f.write("{}")
+            self.assertTrue(charset_processor.has_master_files(data_dir))
+
+        self.assertFalse(charset_processor.has_master_files(data_dir))
+
+    def test_normalize_aliases(self):
+        """Test that bulk normalization matches normalize_alias."""
+        aliases = ["  Both Sides  ", "MiXeD CaSe", "\tTAB\n", "\u0130stanbul"]
+        self.assertEqual(
+            list(charset_processor.normalize_aliases(aliases)),
+            [charset_processor.normalize_alias(a) for a in aliases],
+        )
+        self.assertEqual(
+            charset_processor.normalize_alias("  Both Sides  "), "both sides"
+        )
+
+    def test_process_data_files_merges_aliases(self):
+        """Test that aliases from all sources are normalized, deduplicated and sorted."""
+        unicode_data = {"0041": {"name": "LATIN CAPITAL LETTER A"}}
+        with (
+            patch(
+                "uniff_charset.processor.get_alias_sources",
+                return_value=[
+                    charset_config.ALIAS_SOURCE_FORMAL,
+                    charset_config.ALIAS_SOURCE_INFORMATIVE,
+                    charset_config.ALIAS_SOURCE_CLDR,
+                ],
+            ),
+            patch(
+                "uniff_charset.processor.parse_name_aliases",
+                return_value={"0041": ["Letter A "]},
+            ),
+            patch(
+                "uniff_charset.processor.parse_names_list",
+                return_value={"0041": ["letter a"], "00e9": ["E Acute"]},
+            ),
+            patch(
+                "uniff_charset.processor.parse_cldr_annotations",
+                return_value={"0041": ["Alpha", "letter A"]},
+            ),
+        ):
+            _, aliases_data = charset_processor.process_data_files(
+                {
+                    "name_aliases": "NameAliases.txt",
+                    "names_list": "NamesList.txt",
+                    "cldr_annotations": "annotations.xml",
+                },
+                unicode_data,
+            )
+
+        self.assertEqual(
+            aliases_data, {"0041": ["alpha", "letter a"], "00E9": ["e acute"]}
+        )
+
+    @unittest.skipUnless(charset_processor.ORJSON_AVAILABLE, "orjson is not installed")
+    def test_master_data_file_matches_without_orjson(self):
+        """Test that orjson and the json module write and read the same file."""
+        unicode_data = {
+            "000A": {
+                "name": "LINE FEED",
+                "category": "Cc",
+                "char_obj": "\n",
+                "block": "Basic Latin",
+            },
+            "00E9": {
+                "name": "LATIN SMALL LETTER E WITH ACUTE",
+                "category": "Ll",
+                "char_obj": "\u00e9",
+                "block": "Latin-1 Supplement",
+            },
+        }
+        aliases_data = {"00E9": ['e "acute"', "\u00e9"]}
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = charset_processor.save_master_data_file(
+                unicode_data, aliases_data, data_dir
+            )
+            with open(path, "rb") as f:
+                orjson_output = f.read()
+            self.assertEqual(
+                charset_processor.load_master_data_file(path),
+                (unicode_data, aliases_data),
+            )
+
+            with patch("uniff_charset.processor.ORJSON_AVAILABLE", False):
+                charset_processor.save_master_data_file(
+                    unicode_data, aliases_data, data_dir
+                )
+                with open(path, "rb") as f:
+                    self.assertEqual(f.read(), orjson_output)
+                self.assertEqual(
+                    charset_processor.load_master_data_file(path),
+                    (unicode_data, aliases_data),
+                )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,56 @@
+"""
+Tests for the uniff_core progress module.
+"""
+
+import io
+import unittest
+from unittest.mock import patch
+
+from uniff_core.progress import ProgressDisplay, ProgressStatus
+
+
+class TestProgressDisplay(unittest.TestCase):
+    """Test the hierarchical progress display."""
+
+    def setUp(self):
+        """Set up a progress display."""
+        self.progress = ProgressDisplay()
+
+    @patch.object(ProgressDisplay, "update_display")
+    def test_add_tree(self, mock_update):
+        """Test building the whole tree with a single render."""
+        items = self.progress.add_tree(
+            {"Fetching": ["Downloading", "Cache stored in {cache_dir}"], "Exporting": []},
+            cache_dir="/tmp/cache",
+        )
+
+        mock_update.assert_called_once()
+        self.assertEqual(
+            [item.title for item in self.progress.root_items], ["Fetching", "Exporting"]
+        )
+        self.assertIs(items["Downloading"].parent, items["Fetching"])
+        self.assertEqual(
+            items["Cache stored in {cache_dir}"].title, "Cache stored in /tmp/cache"
+        )
+        self.assertEqual(items["Exporting"].children, [])
+        self.assertEqual(items["Downloading"].status, ProgressStatus.PENDING)
+
+    def test_batch(self):
+        """Test that updates inside a batch render once when the batch ends."""
+        with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            items = self.progress.add_tree({"Fetching": ["Downloading"]})
+            mock_stdout.truncate(0)
+
+            with self.progress.batch():
+                items["Downloading"].set_success()
+                with self.progress.batch():
+                    items["Fetching"].set_success()
+                self.assertEqual(mock_stdout.getvalue(), "")
+
+        # A single render of both items once the outermost batch exits
+        self.assertEqual(mock_stdout.getvalue().count("Fetching"), 1)
+        self.assertEqual(items["Fetching"].status, ProgressStatus.SUCCESS)
+
+
+if __name__ == "__main__":
+    unittest.main()